@@ -26,6 +26,11 @@ Usage:
 Environment variables required (in oz-doc-processor/.env):
   SUPABASE_URL              – e.g. https://xxxx.supabase.co
   SUPABASE_SERVICE_ROLE_KEY – service role key (bypasses RLS)
+
+Optional:
+  SUPABASE_DB_URL           – direct Postgres connection string. When set, the
+                              Phase 2 entity tables are bulk-loaded with COPY
+                              instead of chunked REST upserts.
 """
 
 import os
@@ -33,10 +38,15 @@ import re
 import sys
 import json
 import argparse
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+from queue import Queue
 from typing import Optional
 
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
@@ -47,7 +57,37 @@ from rich.panel import Panel
 
 CSV_PATH = "/Users/aryanjain/Documents/OZL/UsefulDocs/FamilyOfficeDatabase-Lists/USA_Family_Office_Consolidated.csv"
 
-BATCH_SIZE = 500
+BATCH_SIZE = 1000
+MAX_IN_FLIGHT = 4  # concurrent upsert requests per table
+# Shared HTTP pool for the Supabase client: 4 Phase-2 tables × MAX_IN_FLIGHT
+# requests, with headroom. The client default would queue the excess.
+HTTP_POOL_SIZE = 32
+
+# Only the columns Phase 1 reads. Everything is normalized as a string anyway,
+# so they are all loaded as strings and type inference is skipped entirely.
+NEEDED_COLS = [
+    "Firm Name",
+    "Contact First Name",
+    "Contact Last Name",
+    "Contact Title/Position",
+    "Phone Number",
+    "Personal Email Address",
+    "Company Email Address",
+    "Secondary Email",
+    "LinkedIn Profile",
+    "Category",
+    "Website",
+    "Company Street Address",
+    "City",
+    "State/ Province",
+    "Postal/Zip Code",
+    "Country",
+    "Alma Mater",
+    "Company's Areas of Investments/Interest",
+    "Year Founded",
+    "AUM",
+    "About Company",
+]
 
 PEOPLE_TAGS = ["family_office"]
 
@@ -61,13 +101,16 @@ def clean_str(val) -> Optional[str]:
     s = str(val).strip()
     return s if s and s.lower() != "nan" else None
 
+_NON_DIGIT_RE = re.compile(r"\D")
+
 def normalize_phone(val) -> Optional[str]:
     s = clean_str(val)
     if not s:
         return None
     s = s.split(".")[0].strip()
-    digits = re.sub(r"\D", "", s)
-    if len(digits) < 7 or all(c == "0" for c in digits):
+    digits = _NON_DIGIT_RE.sub("", s)
+    # strip("0") runs in C; empty result means the number was all zeros
+    if len(digits) < 7 or not digits.strip("0"):
         return None
     return digits
 
@@ -95,10 +138,48 @@ def normalize_name(first, last) -> Optional[str]:
     full = f"{f} {l}".strip().lower()
     return full if full else None
 
+def load_csv(path: str) -> pd.DataFrame:
+    """
+    Parse the CSV with PyArrow's multi-threaded block reader, restricted to
+    NEEDED_COLS, and hand back a regular pandas DataFrame for Phase 1.
+    """
+    table = pacsv.read_csv(
+        path,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20),
+        convert_options=pacsv.ConvertOptions(
+            column_types={c: pa.string() for c in NEEDED_COLS},
+            include_columns=NEEDED_COLS,
+            strings_can_be_null=True,
+        ),
+    )
+    df = table.to_pandas()
+    # Arrow nulls in string columns come back as None; make them NaN like pd.read_csv did
+    return df.where(df.notna())
+
 def batch(lst: list, n: int):
     for i in range(0, len(lst), n):
         yield lst[i : i + n]
 
+def pipelined_upserts(supabase, table: str, records: list[dict], on_conflict: str):
+    """
+    Upsert `records` in BATCH_SIZE chunks, keeping up to MAX_IN_FLIGHT requests
+    outstanding so the next chunk is already on the wire while the previous
+    response is consumed. Yields (chunk, result) in submission order.
+    """
+    def send(chunk):
+        return supabase.table(table).upsert(chunk, on_conflict=on_conflict).execute()
+
+    with ThreadPoolExecutor(max_workers=MAX_IN_FLIGHT) as ex:
+        in_flight = deque()
+        for chunk in batch(records, BATCH_SIZE):
+            if len(in_flight) >= MAX_IN_FLIGHT:
+                done_chunk, future = in_flight.popleft()
+                yield done_chunk, future.result()
+            in_flight.append((chunk, ex.submit(send, chunk)))
+        while in_flight:
+            done_chunk, future = in_flight.popleft()
+            yield done_chunk, future.result()
+
 
 # ─── Phase 1: Collect unique entities ──────────────────────────────────────────
 
@@ -177,13 +258,13 @@ def phase1_collect(df: pd.DataFrame, limit: Optional[int]):
 
             # ── Phone ────────────────────────────────────────────────────
             if phone and phone not in unique_phones:
-                unique_phones[phone] = {"number": phone, "status": "active", "metadata": {}}
+                unique_phones[phone] = {"number": phone, "status": "active"}
 
             # ── Emails ───────────────────────────────────────────────────
             if personal_email and personal_email not in unique_emails:
-                unique_emails[personal_email] = {"address": personal_email, "status": "active", "metadata": {}}
+                unique_emails[personal_email] = {"address": personal_email, "status": "active"}
             if secondary_email and secondary_email not in unique_emails:
-                unique_emails[secondary_email] = {"address": secondary_email, "status": "active", "metadata": {}}
+                unique_emails[secondary_email] = {"address": secondary_email, "status": "active"}
             # Company email goes to org level, not emails table
 
             # ── LinkedIn ─────────────────────────────────────────────────
@@ -195,7 +276,6 @@ def phase1_collect(df: pd.DataFrame, limit: Optional[int]):
                     "url": linkedin,
                     "profile_name": profile_name,
                     "connection_status": "none",
-                    "metadata": {},
                 }
 
             # ── Record slot for Phase 3 ──────────────────────────────────
@@ -237,51 +317,129 @@ def phase1_collect(df: pd.DataFrame, limit: Optional[int]):
 
 # ─── Phase 2: Batch upsert entity tables → ID maps ────────────────────────────
 
-def upsert_batch(supabase, table: str, records: list[dict], on_conflict: str, label: str) -> dict:
+def upsert_batch(supabase, table: str, records: list[dict], on_conflict: str, label: str,
+                 progress: Optional[Progress] = None) -> dict:
+    if progress is None:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            console=console,
+        ) as progress:
+            return upsert_batch(supabase, table, records, on_conflict, label, progress)
+
     id_map = {}
     conflict_cols = [c.strip() for c in on_conflict.split(",")]
+    task = progress.add_task(f"[bold blue]Upserting {label}...[/bold blue]", total=len(records))
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn(f"[bold blue]Upserting {label}...[/bold blue]"),
-        BarColumn(),
-        MofNCompleteColumn(),
-        console=console,
-    ) as progress:
-        task = progress.add_task(label, total=len(records))
+    for chunk, result in pipelined_upserts(supabase, table, records, on_conflict):
+        for row in result.data:
+            if len(conflict_cols) == 1:
+                key = row[conflict_cols[0]]
+            else:
+                key = tuple(row[c] for c in conflict_cols)
+            id_map[key] = row["id"]
+        progress.advance(task, len(chunk))
 
-        for chunk in batch(records, BATCH_SIZE):
-            result = (
-                supabase.table(table)
-                .upsert(chunk, on_conflict=on_conflict)
-                .execute()
-            )
-            for row in result.data:
-                if len(conflict_cols) == 1:
-                    key = row[conflict_cols[0]]
-                else:
-                    key = tuple(row[c] for c in conflict_cols)
-                id_map[key] = row["id"]
-            progress.advance(task, len(chunk))
+    return id_map
+
+
+def copy_upsert(pg_url: str, table: str, records: list[dict], on_conflict: str, label: str,
+                progress: Progress) -> dict:
+    """
+    Bulk path for upsert_batch: COPY all records into a temp staging table on a
+    direct Postgres connection, then merge into `table` with a single
+    INSERT ... ON CONFLICT DO UPDATE. Two round-trips instead of one per chunk.
+    Only supports a single conflict column (true for every entity table).
+    """
+    import psycopg
+    from psycopg import sql
+    from psycopg.types.json import Jsonb
+
+    id_map = {}
+    task = progress.add_task(f"[bold blue]Copying {label}...[/bold blue]", total=len(records))
+    if not records:
+        return id_map
+
+    columns = list(dict.fromkeys(k for r in records for k in r))
+    staging = sql.Identifier(f"_staging_{table}")
+    target  = sql.Identifier(table)
+    key     = sql.Identifier(on_conflict)
+    cols    = sql.SQL(", ").join(map(sql.Identifier, columns))
+    updates = sql.SQL(", ").join(
+        sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(c)) for c in columns if c != on_conflict
+    )
 
+    with psycopg.connect(pg_url) as conn, conn.cursor() as cur:
+        cur.execute(sql.SQL(
+            "CREATE TEMP TABLE {} (LIKE {} INCLUDING DEFAULTS) ON COMMIT DROP"
+        ).format(staging, target))
+
+        with cur.copy(sql.SQL("COPY {} ({}) FROM STDIN").format(staging, cols)) as copy:
+            for i, rec in enumerate(records, 1):
+                copy.write_row([
+                    Jsonb(v) if isinstance(v, dict) else v
+                    for v in (rec.get(c) for c in columns)
+                ])
+                if i % BATCH_SIZE == 0:
+                    progress.advance(task, BATCH_SIZE)
+
+        cur.execute(sql.SQL(
+            "INSERT INTO {target} ({cols}) SELECT {cols} FROM {staging} "
+            "ON CONFLICT ({key}) DO UPDATE SET {updates} RETURNING id::text, {key}"
+        ).format(target=target, cols=cols, staging=staging, key=key, updates=updates))
+        # id comes back as text, matching the ids upsert_batch gets from PostgREST
+        for row_id, value in cur:
+            id_map[value] = row_id
+
+    progress.update(task, completed=len(records))
     return id_map
 
 
-def phase2_upsert_entities(supabase, unique_phones, unique_emails, unique_linkedins, unique_orgs, dry_run: bool):
+def phase2_upsert_entities(supabase, unique_phones, unique_emails, unique_linkedins, unique_orgs, dry_run: bool,
+                           pg_url: Optional[str] = None):
     if dry_run:
         console.print("[yellow]DRY RUN: skipping database writes[/yellow]")
         return {}, {}, {}, {}
 
-    phone_id_map    = upsert_batch(supabase, "phones",            list(unique_phones.values()),    "number",  "phones")
-    email_id_map    = upsert_batch(supabase, "emails",            list(unique_emails.values()),    "address", "emails")
-    linkedin_id_map = upsert_batch(supabase, "linkedin_profiles", list(unique_linkedins.values()), "url",     "linkedin_profiles")
-    org_id_map      = upsert_batch(supabase, "organizations",     list(unique_orgs.values()),      "name",    "organizations")
+    # COPY over a direct connection when available; each worker thread opens
+    # its own connection inside copy_upsert.
+    if pg_url:
+        upsert, target = copy_upsert, pg_url
+    else:
+        upsert, target = upsert_batch, supabase
+
+    # The four entity tables share no keys, so their upsert chains run on
+    # separate threads (HTTP-bound, GIL released) under one progress display.
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+    ) as progress, ThreadPoolExecutor(max_workers=4) as ex:
+        f_phones    = ex.submit(upsert, target, "phones",            list(unique_phones.values()),    "number",  "phones",            progress)
+        f_emails    = ex.submit(upsert, target, "emails",            list(unique_emails.values()),    "address", "emails",            progress)
+        f_linkedins = ex.submit(upsert, target, "linkedin_profiles", list(unique_linkedins.values()), "url",     "linkedin_profiles", progress)
+        f_orgs      = ex.submit(upsert, target, "organizations",     list(unique_orgs.values()),      "name",    "organizations",     progress)
+
+        phone_id_map    = f_phones.result()
+        email_id_map    = f_emails.result()
+        linkedin_id_map = f_linkedins.result()
+        org_id_map      = f_orgs.result()
 
     return phone_id_map, email_id_map, linkedin_id_map, org_id_map
 
 
 # ─── Phase 3: Resolve people + collect junction records ────────────────────────
 
+# Constant junction columns, shared by every row instead of rebuilt per row
+_PHONE_WORK       = {"label": "work",      "is_primary": True,  "source": "family_office_import"}
+_EMAIL_PERSONAL   = {"label": "personal",  "is_primary": True,  "source": "family_office_import"}
+_EMAIL_SECONDARY  = {"label": "secondary", "is_primary": False, "source": "family_office_import"}
+_LINKEDIN_PRIMARY = {"is_primary": True, "source": "family_office_import"}
+
 def phase3_resolve_people(person_slots, phone_id_map, email_id_map, linkedin_id_map, org_id_map, dry_run: bool):
     """
     Walk all person slots. Dedup people using a priority chain:
@@ -291,16 +449,24 @@ def phase3_resolve_people(person_slots, phone_id_map, email_id_map, linkedin_id_
     """
     people_to_insert: list[dict] = []
 
-    # Dedup maps: identifier → person_list_index
-    linkedin_dedup: dict[str, int] = {}
-    email_dedup:    dict[str, int] = {}
-    phone_name_dedup: dict[tuple, int] = {}
-
-    # Junction collection
-    j_person_phones:   list[tuple[int, dict]] = []
-    j_person_emails:   list[tuple[int, dict]] = []
-    j_person_linkedin: list[tuple[int, dict]] = []
-    j_person_orgs:     list[tuple[int, dict]] = []
+    # Dedup map: tagged identifier → person_list_index. One dict for all three
+    # tiers ("l:<linkedin>", "e:<email>", "p:<phone>|<name>") so a hit on the
+    # common LinkedIn path is a single probe.
+    dedup: dict[str, int] = {}
+
+    # Junction collection: (person_idx, entity_id, extra columns). The extra
+    # columns are shared constant dicts wherever they don't vary per row.
+    j_person_phones:   list[tuple[int, str, dict]] = []
+    j_person_emails:   list[tuple[int, str, dict]] = []
+    j_person_linkedin: list[tuple[int, str, dict]] = []
+    j_person_orgs:     list[tuple[int, str, dict]] = []
+
+    # (person_idx, entity_id) pairs already emitted — a reused person would
+    # otherwise get the same junction row once per duplicate slot
+    phones_emitted:   set[tuple[int, str]] = set()
+    emails_emitted:   set[tuple[int, str]] = set()
+    linkedin_emitted: set[tuple[int, str]] = set()
+    orgs_emitted:     set[tuple[int, str]] = set()
 
     stats = {"new_people": 0, "reused_people": 0, "skipped_nameless": 0}
 
@@ -333,22 +499,21 @@ def phase3_resolve_people(person_slots, phone_id_map, email_id_map, linkedin_id_
                 continue
 
             # ── Resolve or create person (priority chain) ────────────────
-            person_idx = None
-
-            # Priority 1: LinkedIn
-            if linkedin and linkedin in linkedin_dedup:
-                person_idx = linkedin_dedup[linkedin]
-                stats["reused_people"] += 1
-
-            # Priority 2: Personal email
-            elif p_email and p_email in email_dedup:
-                person_idx = email_dedup[p_email]
-                stats["reused_people"] += 1
+            # Keys in priority order: LinkedIn → personal email → phone+name
+            keys = []
+            if linkedin:
+                keys.append("l:" + linkedin)
+            if p_email:
+                keys.append("e:" + p_email)
+            if phone:
+                keys.append(f"p:{phone}|{name_lower}")
 
-            # Priority 3: Phone + name
-            elif phone and (phone, name_lower) in phone_name_dedup:
-                person_idx = phone_name_dedup[(phone, name_lower)]
-                stats["reused_people"] += 1
+            person_idx = None
+            for k in keys:
+                person_idx = dedup.get(k)
+                if person_idx is not None:
+                    stats["reused_people"] += 1
+                    break
 
             # New person
             if person_idx is None:
@@ -365,64 +530,45 @@ def phase3_resolve_people(person_slots, phone_id_map, email_id_map, linkedin_id_
                 })
                 stats["new_people"] += 1
 
-            # Register in all applicable dedup maps (so future dupes merge)
-            if linkedin:
-                linkedin_dedup[linkedin] = person_idx
-            if p_email:
-                email_dedup[p_email] = person_idx
-            if phone and name_lower:
-                phone_name_dedup[(phone, name_lower)] = person_idx
+            # Register under every applicable key (so future dupes merge)
+            for k in keys:
+                dedup[k] = person_idx
 
             # ── Junction: person_phones ──────────────────────────────────
             if phone and not dry_run:
                 phone_id = phone_id_map.get(phone)
-                if phone_id:
-                    j_person_phones.append((person_idx, {
-                        "phone_id": phone_id,
-                        "label":    "work",
-                        "is_primary": True,
-                        "source":   "family_office_import",
-                    }))
+                if phone_id and (person_idx, phone_id) not in phones_emitted:
+                    phones_emitted.add((person_idx, phone_id))
+                    j_person_phones.append((person_idx, phone_id, _PHONE_WORK))
 
             # ── Junction: person_emails ──────────────────────────────────
             if p_email and not dry_run:
                 email_id = email_id_map.get(p_email)
-                if email_id:
-                    j_person_emails.append((person_idx, {
-                        "email_id":  email_id,
-                        "label":     "personal",
-                        "is_primary": True,
-                        "source":    "family_office_import",
-                    }))
+                if email_id and (person_idx, email_id) not in emails_emitted:
+                    emails_emitted.add((person_idx, email_id))
+                    j_person_emails.append((person_idx, email_id, _EMAIL_PERSONAL))
 
             if s_email and not dry_run:
                 email_id = email_id_map.get(s_email)
-                if email_id:
-                    j_person_emails.append((person_idx, {
-                        "email_id":  email_id,
-                        "label":     "secondary",
-                        "is_primary": False,
-                        "source":    "family_office_import",
-                    }))
+                if email_id and (person_idx, email_id) not in emails_emitted:
+                    emails_emitted.add((person_idx, email_id))
+                    j_person_emails.append((person_idx, email_id, _EMAIL_SECONDARY))
 
             # ── Junction: person_linkedin ────────────────────────────────
             if linkedin and not dry_run:
                 li_id = linkedin_id_map.get(linkedin)
-                if li_id:
-                    j_person_linkedin.append((person_idx, {
-                        "linkedin_id": li_id,
-                        "is_primary":  True,
-                        "source":      "family_office_import",
-                    }))
+                if li_id and (person_idx, li_id) not in linkedin_emitted:
+                    linkedin_emitted.add((person_idx, li_id))
+                    j_person_linkedin.append((person_idx, li_id, _LINKEDIN_PRIMARY))
 
             # ── Junction: person_organizations ───────────────────────────
             if firm and not dry_run:
                 org_id = org_id_map.get(firm)
-                if org_id:
-                    j_person_orgs.append((person_idx, {
-                        "organization_id": org_id,
-                        "title":           title,
-                        "is_primary":      True,
+                if org_id and (person_idx, org_id) not in orgs_emitted:
+                    orgs_emitted.add((person_idx, org_id))
+                    j_person_orgs.append((person_idx, org_id, {
+                        "title":      title,
+                        "is_primary": True,
                     }))
 
     console.print(f"  [dim]New people to insert: {stats['new_people']:,}[/dim]")
@@ -466,77 +612,92 @@ def phase4_insert_people(supabase, people_to_insert: list[dict], dry_run: bool)
 
 # ─── Phase 5: Insert all junction records ──────────────────────────────────────
 
+# (key in the Phase 3 junctions dict, target table, entity id column, on_conflict columns)
+JUNCTION_SPECS = [
+    ("person_phones",   "person_phones",        "phone_id",        "person_id,phone_id"),
+    ("person_emails",   "person_emails",        "email_id",        "person_id,email_id"),
+    ("person_linkedin", "person_linkedin",      "linkedin_id",     "person_id,linkedin_id"),
+    ("person_orgs",     "person_organizations", "organization_id", "person_id,organization_id"),
+]
+
+
+# Bound on queued-but-unwritten chunks per junction table (memory backpressure)
+JUNCTION_QUEUE_SIZE = 8
+
+_DONE = object()  # end-of-stream marker for junction writer queues
+
+
 def phase5_insert_junctions(supabase, junctions: dict, person_uuids: list[str], dry_run: bool):
     if dry_run:
         for table_key, records in junctions.items():
             console.print(f"[yellow]DRY RUN: would insert {len(records):,} {table_key} rows[/yellow]")
         return
 
-    # ── person_phones ──────────────────────────────────────────────────────────
-    pp_records = []
-    seen = set()
-    for (pidx, data) in junctions["person_phones"]:
-        pid = person_uuids[pidx]
-        key = (pid, data["phone_id"])
-        if key not in seen:
-            seen.add(key)
-            pp_records.append({"person_id": pid, **data})
-    _batch_upsert(supabase, "person_phones", pp_records, "person_id,phone_id", "person_phones")
-
-    # ── person_emails ──────────────────────────────────────────────────────────
-    pe_records = []
-    seen = set()
-    for (pidx, data) in junctions["person_emails"]:
-        pid = person_uuids[pidx]
-        key = (pid, data["email_id"])
-        if key not in seen:
-            seen.add(key)
-            pe_records.append({"person_id": pid, **data})
-    _batch_upsert(supabase, "person_emails", pe_records, "person_id,email_id", "person_emails")
-
-    # ── person_linkedin ────────────────────────────────────────────────────────
-    pl_records = []
-    seen = set()
-    for (pidx, data) in junctions["person_linkedin"]:
-        pid = person_uuids[pidx]
-        key = (pid, data["linkedin_id"])
-        if key not in seen:
-            seen.add(key)
-            pl_records.append({"person_id": pid, **data})
-    _batch_upsert(supabase, "person_linkedin", pl_records, "person_id,linkedin_id", "person_linkedin")
-
-    # ── person_organizations ───────────────────────────────────────────────────
-    po_records = []
-    seen = set()
-    for (pidx, data) in junctions["person_orgs"]:
-        pid = person_uuids[pidx]
-        key = (pid, data["organization_id"])
-        if key not in seen:
-            seen.add(key)
-            po_records.append({"person_id": pid, **data})
-    _batch_upsert(supabase, "person_organizations", po_records, "person_id,organization_id", "person_organizations")
-
-
-def _batch_upsert(supabase, table: str, records: list[dict], on_conflict: str, label: str):
-    if not records:
-        console.print(f"  [dim]{label}: 0 records, skipping[/dim]")
-        return
-
-    inserted = 0
+    # One writer thread per junction table, each fed through a bounded queue.
+    # The main thread builds record chunks (attaching person UUIDs) round-robin
+    # across tables, so all four tables stream to Supabase at once and at most
+    # JUNCTION_QUEUE_SIZE chunks per table are materialized ahead of the writer.
+    # Junctions arrive already deduped from Phase 3.
     with Progress(
         SpinnerColumn(),
-        TextColumn(f"  [bold blue]Upserting {label}...[/bold blue]"),
+        TextColumn("{task.description}"),
         BarColumn(),
         MofNCompleteColumn(),
         console=console,
-    ) as progress:
-        task = progress.add_task(label, total=len(records))
-        for chunk in batch(records, BATCH_SIZE):
+    ) as progress, ThreadPoolExecutor(max_workers=len(JUNCTION_SPECS)) as ex:
+        queues  = []
+        writers = []
+        for junction_key, table, _, on_conflict in JUNCTION_SPECS:
+            q = Queue(maxsize=JUNCTION_QUEUE_SIZE)
+            task = progress.add_task(f"  [bold blue]Upserting {table}...[/bold blue]",
+                                     total=len(junctions[junction_key]))
+            queues.append(q)
+            writers.append(ex.submit(_junction_writer, supabase, table, on_conflict, q, progress, task))
+
+        # Writers always get _DONE, even if building a chunk raises, so they stop
+        # and the executor can exit with the original error instead of hanging.
+        try:
+            producers = [_junction_chunks(junctions[key], id_col, person_uuids) for key, _, id_col, _ in JUNCTION_SPECS]
+            for chunks in zip_longest(*producers):
+                for q, chunk in zip(queues, chunks):
+                    if chunk is not None:
+                        q.put(chunk)
+        finally:
+            for q in queues:
+                q.put(_DONE)
+
+        counts = [w.result() for w in writers]
+
+    for (_, table, _, _), inserted in zip(JUNCTION_SPECS, counts):
+        console.print(f"  [dim]{table}: {inserted:,} rows upserted[/dim]")
+
+
+def _junction_chunks(items: list[tuple[int, str, dict]], id_col: str, person_uuids: list[str]):
+    for part in batch(items, BATCH_SIZE):
+        yield [{**extra, "person_id": person_uuids[pidx], id_col: eid} for (pidx, eid, extra) in part]
+
+
+def _junction_writer(supabase, table: str, on_conflict: str, q: Queue, progress: Progress, task) -> int:
+    """
+    Drain `q` until _DONE, upserting each chunk. After a failure the queue is
+    still drained (so the producer never blocks on a full queue) and the error
+    is re-raised at the end.
+    """
+    inserted = 0
+    error = None
+    while (chunk := q.get()) is not _DONE:
+        if error is not None:
+            continue
+        try:
             supabase.table(table).upsert(chunk, on_conflict=on_conflict).execute()
-            inserted += len(chunk)
-            progress.advance(task, len(chunk))
-
-    console.print(f"  [dim]{label}: {inserted:,} rows upserted[/dim]")
+        except Exception as e:
+            error = e
+            continue
+        inserted += len(chunk)
+        progress.advance(task, len(chunk))
+    if error is not None:
+        raise error
+    return inserted
 
 
 # ─── Summary ───────────────────────────────────────────────────────────────────
@@ -586,19 +747,33 @@ def main():
     load_dotenv(env_path)
 
     supabase = None
+    pg_url = None
     if not args.dry_run:
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
         if not url or not key:
             console.print("[red]ERROR: SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set in oz-doc-processor/.env[/red]")
             sys.exit(1)
-        from supabase import create_client
-        supabase = create_client(url, key)
+        import httpx
+        from supabase import ClientOptions, create_client
+        http_client = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE),
+            ),
+            timeout=120,
+            follow_redirects=True,
+        )
+        supabase = create_client(url, key, options=ClientOptions(httpx_client=http_client))
         console.print(f"[green]Connected to Supabase:[/green] {url}")
+        pg_url = os.getenv("SUPABASE_DB_URL")
+        if pg_url:
+            console.print("[green]Direct Postgres URL found:[/green] entity tables will be bulk-loaded via COPY")
 
     # ── Load CSV ─────────────────────────────────────────────────────────────
     console.print(f"\nLoading CSV...")
-    df = pd.read_csv(CSV_PATH, encoding="utf-8-sig", low_memory=False)
+    df = load_csv(CSV_PATH)
     console.print(f"[dim]Loaded {len(df):,} rows[/dim]")
 
     # ── Phase 1 ──────────────────────────────────────────────────────────────
@@ -609,7 +784,7 @@ def main():
     # ── Phase 2 ──────────────────────────────────────────────────────────────
     console.print("\n[bold]Phase 2: Upserting entity tables[/bold]")
     phone_id_map, email_id_map, linkedin_id_map, org_id_map = phase2_upsert_entities(
-        supabase, unique_phones, unique_emails, unique_linkedins, unique_orgs, args.dry_run
+        supabase, unique_phones, unique_emails, unique_linkedins, unique_orgs, args.dry_run, pg_url
     )
 
     # ── Phase 3 ──────────────────────────────────────────────────────────────
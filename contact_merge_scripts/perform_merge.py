@@ -26,43 +26,37 @@ main_cols = list(main_df.columns)
 target_df_aligned = target_df.reindex(columns=main_cols)
 
 # 2. Key Generation
-def clean(val):
-    return str(val).lower().strip() if pd.notna(val) else ""
+KEY_COLS = ['Firm Name', 'Contact First Name', 'Contact Last Name', 'Company Email Address']
 
-def get_key(row):
-    # Composite key: Firm, First, Last, Email
-    return (
-        clean(row.get('Firm Name')),
-        clean(row.get('Contact First Name')),
-        clean(row.get('Contact Last Name')),
-        clean(row.get('Company Email Address'))
-    )
+def clean(col):
+    return col.fillna('').astype(str).str.lower().str.strip()
 
-existing_keys = set()
-for _, row in main_df.iterrows():
-    existing_keys.add(get_key(row))
+def make_key(df):
+    # Composite key: Firm, First, Last, Email (built column-wise, no iterrows).
+    # Joined on the ASCII unit separator so no real field value can collide.
+    cols = df.reindex(columns=KEY_COLS)
+    key = clean(cols[KEY_COLS[0]])
+    for c in KEY_COLS[1:]:
+        key = key + '\x1f' + clean(cols[c])
+    return key
 
-# 3. Filter New Records
-new_rows = []
-skipped_count = 0
+main_keys = make_key(main_df)
+target_keys = make_key(target_df_aligned)
 
-for _, row in target_df_aligned.iterrows():
-    k = get_key(row)
-    if k not in existing_keys:
-        new_rows.append(row)
-    else:
-        skipped_count += 1
+# 3. Filter New Records
+is_new = ~target_keys.isin(main_keys)
+new_df = target_df_aligned[is_new]
+skipped_count = int((~is_new).sum())
 
 print(f"Skipped {skipped_count} duplicate records.")
-print(f"Found {len(new_rows)} unique records to append.")
+print(f"Found {len(new_df)} unique records to append.")
 
 # 4. Smart Conflict Resolution (Optional Step - currently just appending unique keys)
 # If a record has same Name but differs in Firm/Email, it triggers a new key,
 # so it is effectively added as a new row (job change or stale data).
 # This aligns with the 'Append' strategy for unique fingerprints.
 
-if new_rows:
-    new_df = pd.DataFrame(new_rows)
+if len(new_df):
     # Concatenate
     final_df = pd.concat([main_df, new_df], ignore_index=True)
 else:
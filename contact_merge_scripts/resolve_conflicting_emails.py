@@ -1,33 +1,54 @@
 import pandas as pd
 import sys
 
+COLS = ['Firm Name', 'Company Email Address']
+CHUNK_SIZE = 200_000
+
+def count_pairs(csv_path):
+    """
+    Stream the CSV in chunks (only the two columns we need) and accumulate
+    (firm, email) → contact count, in first-seen order within each firm.
+    Peak memory is one chunk plus the distinct pairs seen so far.
+    """
+    pair_counts = None
+    for chunk in pd.read_csv(csv_path, usecols=COLS, dtype='string[pyarrow]', chunksize=CHUNK_SIZE):
+        # Filter out companies with no valid 'Firm Name' or no valid 'Company Email Address'
+        chunk = chunk.dropna(subset=COLS)
+        
+        # Clean email strings (Arrow string kernels)
+        chunk['Company Email Address'] = chunk['Company Email Address'].str.lower().str.strip()
+        
+        vc = chunk.value_counts(COLS, sort=False)
+        if pair_counts is None:
+            pair_counts = vc
+        else:
+            pair_counts = pd.concat([pair_counts, vc]).groupby(level=[0, 1], sort=False).sum()
+    return pair_counts
+
 def main():
     csv_path = "/Users/aryanjain/Documents/OZL/UsefulDocs/FamilyOfficeDatabase-Lists/USA_Family_Office_Consolidated.csv"
     try:
-        df = pd.read_csv(csv_path)
+        pair_counts = count_pairs(csv_path)
     except Exception as e:
         print(f"Error loading CSV: {e}")
         return
 
-    # Filter out companies with no valid 'Firm Name' or no valid 'Company Email Address'
-    valid_df = df.dropna(subset=['Firm Name', 'Company Email Address']).copy()
-    
-    # Clean email strings
-    valid_df['Company Email Address'] = valid_df['Company Email Address'].str.lower().str.strip()
+    print("--- Companies with Conflicting Emails ---")
     
-    grouped = valid_df.groupby('Firm Name')
+    if pair_counts is None:
+        return
     
-    print("--- Companies with Conflicting Emails ---")
+    # Distinct emails per firm = how often each firm appears among the pairs
+    firms = pair_counts.index.get_level_values('Firm Name')
+    firm_email_counts = firms.value_counts()
+    conflict_firms = firm_email_counts[firm_email_counts > 1].index
+    conflict_pairs = pair_counts[firms.isin(conflict_firms)]
     
-    for firm_name, group in grouped:
-        if len(group) > 1:
-            unique_emails = group['Company Email Address'].unique()
-            if len(unique_emails) > 1:
-                print(f"\nFirm: {firm_name}")
-                print("Available Emails:")
-                for email in unique_emails:
-                    count = len(group[group['Company Email Address'] == email])
-                    print(f"  - {email} (used by {count} contacts)")
+    for firm_name, emails in conflict_pairs.groupby(level='Firm Name'):
+        print(f"\nFirm: {firm_name}")
+        print("Available Emails:")
+        for (_, email), count in emails.items():
+            print(f"  - {email} (used by {count} contacts)")
 
 if __name__ == "__main__":
     main()
@@ -1,18 +1,49 @@
 import os
-import json
+import hashlib
 import logging
-import base64
+import pybase64
+import ijson
+import orjson
+import re
+import shutil
 import sys
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List
-from mistral_ocr import ocr_with_mistral, parse_and_save_markdown
-from excel_processor import process_excel_to_markdown
+from typing import Dict, List, Optional
+from mistral_ocr import (
+    OCR_CACHE_VERSION,
+    OCR_MODEL,
+    PAGES_PER_REQUEST,
+    ImageAnnotation,
+    async_ocr_client,
+    ocr_batch,
+    ocr_with_mistral_async,
+    save_markdown,
+)
+from excel_processor import CONVERTER_VERSION, process_excel_to_markdown
 from dotenv import load_dotenv
-from src.config import PROCESSABLE_EXTS
+from src.config import (
+    OCR_BATCH_ENABLED,
+    OCR_BATCH_MAX_WAIT,
+    OCR_BATCH_MIN_FILES,
+    OCR_CACHE_DIR,
+    OCR_CONCURRENCY,
+    PROCESSABLE_EXTS,
+)
 
 INPUT_DIR_NAME = "input"
 TEMP_DIR_NAME = "temp"
 IMAGES_DIR_NAME = "images"
+IMAGE_WORKERS = 8
+# Records which OCR response an images directory was extracted from (and each image's size),
+# so rerunning on the same cached response skips decoding images that are already on disk
+IMAGE_MANIFEST_NAME = ".ocr_images.json"
+IMAGE_DECODE_CHUNK = 64 * 1024  # base64 chars per decode step; a multiple of 4 so chunks decode independently
+_IMAGE_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+# "data:image/<format>[;params]," prefix of an inline OCR image.
+_DATA_URL_RE = re.compile(r"data:image/([^;,/]*)[^,]*,")
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -20,15 +51,30 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 import asyncio
 
 
+# Lower-cased listing name -> directory, rebuilt whenever listing-docs/ changes.
+_listing_index: Dict[str, Path] = {}
+_listing_index_mtime: Optional[int] = None
+
+
+def _listing_dirs_by_name(parent: Path) -> Dict[str, Path]:
+    global _listing_index, _listing_index_mtime
+    mtime = parent.stat().st_mtime_ns
+    if mtime != _listing_index_mtime:
+        # scandir entries know their type from the directory read itself, so no stat per entry
+        with os.scandir(parent) as entries:
+            _listing_index = {e.name.lower(): Path(e.path) for e in entries if e.is_dir()}
+        _listing_index_mtime = mtime
+    return _listing_index
+
+
 def get_listing_dir(listing_name: str) -> Path:
     listing_dir = Path(f"listing-docs/{listing_name}")
     if listing_dir.exists():
         return listing_dir
 
-    parent = Path("listing-docs")
-    for candidate in parent.iterdir():
-        if candidate.is_dir() and candidate.name.lower() == listing_name.lower():
-            return candidate
+    candidate = _listing_dirs_by_name(Path("listing-docs")).get(listing_name.lower())
+    if candidate is not None:
+        return candidate
     raise FileNotFoundError(f"Listing directory not found: {listing_name}")
 
 
@@ -48,106 +94,272 @@ def _validate_input_dir(listing_dir: Path) -> Path:
 
 def get_process_files(listing_dir: Path) -> List[Path]:
     input_dir = _validate_input_dir(listing_dir)
-    all_files = sorted(list(input_dir.glob("*")))
-    return [
-        f for f in all_files
-        if f.is_file()
-        and f.suffix.lower() in PROCESSABLE_EXTS
-        and not f.name.endswith("_markdown.md")  # skip output file itself
-    ]
+    # scandir entries carry their file type from the directory read, so filtering needs no per-file stat
+    with os.scandir(input_dir) as entries:
+        return sorted(
+            Path(e.path) for e in entries
+            if os.path.splitext(e.name)[1].lower() in PROCESSABLE_EXTS
+            and not e.name.endswith("_markdown.md")  # skip output file itself
+            and e.is_file()
+        )
 
 
-def extract_images_from_ocr(json_path: str, output_dir: str):
+def _stream_ocr_pages(json_path: str):
     """
-    Extracts images from the OCR JSON response and saves them as actual image files.
+    Streams the pages of an OCR JSON response one at a time, so only the current
+    page's base64 images are held in memory.
     """
-    if not os.path.exists(json_path):
-        logging.warning(f"No OCR JSON found at {json_path}. Skipping image extraction.")
-        return 0
-        
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    with open(json_path, 'rb') as f:
+        yield from ijson.items(f, "pages.item", use_float=True)
+
 
+def _iter_ocr_pages(json_path: str):
+    """Like _stream_ocr_pages, but logs a read/parse error and stops instead of raising."""
     try:
-        with open(json_path, 'r') as f:
-            data = json.load(f)
+        yield from _stream_ocr_pages(json_path)
     except Exception as e:
-        logging.error(f"Failed to load OCR JSON at {json_path}: {e}")
+        logging.error(f"Failed to read OCR JSON at {json_path}: {e}")
+
+
+def _annotation_fields(ann):
+    """Returns (image_type, description) from an OCR image annotation (JSON string, dict, or empty)."""
+    if not ann:
+        return "unknown", "No annotation available"
+    if isinstance(ann, str):
+        try:
+            ann = orjson.loads(ann)
+        except orjson.JSONDecodeError:
+            pass
+    if isinstance(ann, dict):
+        return ann.get("image_type"), ann.get("description")
+    return "unknown", str(ann)
+
+
+def _save_image(path: Path, image_data: str, start: int = 0) -> int:
+    """
+    Decodes the base64 payload of image_data (beginning at `start`, past any data-URL
+    header) into path, IMAGE_DECODE_CHUNK characters at a time, so the decoded image
+    is never held in memory whole. Returns the number of bytes written.
+    """
+    size = 0
+    # Raw fd write: no buffered file object (and its fstat) per image, just open/write/close.
+    fd = os.open(path, _IMAGE_OPEN_FLAGS, 0o666)
+    try:
+        for offset in range(start, len(image_data), IMAGE_DECODE_CHUNK):
+            # pybase64 releases the GIL while decoding, so pool workers decode and write in parallel.
+            data = memoryview(pybase64.b64decode(image_data[offset:offset + IMAGE_DECODE_CHUNK], validate=False))
+            size += len(data)
+            while data:
+                data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+    return size
+
+
+def _reusable_images(out_dir: Path, source_key: Optional[str]) -> Dict[str, int]:
+    """
+    Sizes of the images a previous run extracted into out_dir from the same OCR response
+    (same source_key), which can be kept without decoding them again. Any other manifest
+    is removed up front, since the files it describes are about to be overwritten.
+    """
+    manifest_path = out_dir / IMAGE_MANIFEST_NAME
+    try:
+        manifest = orjson.loads(manifest_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    if source_key is not None and manifest.get("source") == source_key:
+        return manifest.get("images") or {}
+    manifest_path.unlink(missing_ok=True)
+    return {}
+
+
+def _image_kept(path: Path, size: Optional[int]) -> bool:
+    try:
+        return size is not None and os.stat(path).st_size == size
+    except FileNotFoundError:
+        return False
+
+
+def extract_images_from_ocr(ocr_source: str | dict, output_dir: str):
+    """
+    Extracts images from the OCR response and saves them as actual image files.
+    `ocr_source` is either a path to the saved OCR JSON or the already-loaded response dict.
+    """
+    if isinstance(ocr_source, dict):
+        pages = ocr_source.get("pages") or []
+    elif os.path.exists(ocr_source):
+        pages = _iter_ocr_pages(ocr_source)
+    else:
+        logging.warning(f"No OCR JSON found at {ocr_source}. Skipping image extraction.")
         return 0
+    return _extract_images(pages, output_dir)
+
+
+def consume_ocr(
+    ocr_source: str | dict, output_markdown_path: str, output_dir: str, source_key: Optional[str] = None
+) -> List[str]:
+    """
+    Single pass over the OCR pages that both saves the markdown to
+    output_markdown_path and extracts the images into output_dir.
+    Equivalent to parse_and_save_markdown followed by extract_images_from_ocr;
+    returns the per-page markdown.
+
+    source_key identifies the OCR response (e.g. its cache entry); when output_dir was
+    last filled from the same key, images already on disk are not decoded again.
+    """
+    if isinstance(ocr_source, dict):
+        pages = ocr_source.get("pages") or []
+    else:
+        pages = _stream_ocr_pages(ocr_source)
+
+    parts = []
+
+    def collect_markdown(page):
+        if "markdown" in page:
+            parts.append(page["markdown"])
+
+    _extract_images(pages, output_dir, on_page=collect_markdown, source_key=source_key)
+    save_markdown(parts, output_markdown_path)
+    return parts
+
+
+def _extract_images(pages, output_dir: str, on_page=None, source_key: Optional[str] = None) -> int:
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    reusable = _reusable_images(out_dir, source_key)
 
     image_count = 0
     image_descriptions = []
+    image_sizes = {}
 
-    if "pages" in data and isinstance(data["pages"], list):
-        for page_idx, page in enumerate(data["pages"]):
+    pending_writes = []
+    with ThreadPoolExecutor(max_workers=IMAGE_WORKERS) as pool:
+        for page_idx, page in enumerate(pages):
+            if on_page is not None:
+                on_page(page)
             if "images" in page and isinstance(page["images"], list):
                 for img_index, image in enumerate(page["images"]):
-                    if "image_base64" in image and "id" in image:
+                    if image.get("image_base64") and "id" in image:
                         try:
                             image_data = image["image_base64"]
-                            if image_data.startswith("data:image/"):
-                                header, base64_data = image_data.split(",", 1)
-                                image_format = header.split(";")[0].split("/")[1]
+                            data_url = _DATA_URL_RE.match(image_data)
+                            if data_url:
+                                base64_start = data_url.end()
+                                image_format = data_url.group(1)
+                            elif image_data.startswith("data:image/"):
+                                raise ValueError("malformed data URL")
                             else:
-                                base64_data = image_data
+                                base64_start = 0
                                 image_format = "jpeg"
 
-                            decoded_image = base64.b64decode(base64_data)
                             image_id = image["id"]
                             # Clean filename
                             clean_id = image_id.split('/')[-1]
                             filename = clean_id if clean_id.endswith(f".{image_format}") else f"{clean_id}.{image_format}"
-                            filepath = os.path.join(output_dir, filename)
 
-                            with open(filepath, "wb") as f:
-                                f.write(decoded_image)
-
-                            logging.info(f"Saved image: {filename} to {output_dir}")
+                            path = out_dir / filename
+                            if _image_kept(path, reusable.get(filename)):
+                                write = Future()
+                                write.set_result(reusable[filename])
+                            else:
+                                # Decode and write on the pool while this thread keeps walking the OCR pages.
+                                write = pool.submit(_save_image, path, image_data, base64_start)
 
+                            image_get = image.get
+                            image_type, description = _annotation_fields(image_get("image_annotation"))
                             annotation_info = {
                                 "filename": filename,
                                 "page": page_idx,
                                 "image_index": img_index,
                                 "image_id": image_id,
-                                "top_left_x": image.get("top_left_x"),
-                                "top_left_y": image.get("top_left_y"),
-                                "bottom_right_x": image.get("bottom_right_x"),
-                                "bottom_right_y": image.get("bottom_right_y")
+                                "top_left_x": image_get("top_left_x"),
+                                "top_left_y": image_get("top_left_y"),
+                                "bottom_right_x": image_get("bottom_right_x"),
+                                "bottom_right_y": image_get("bottom_right_y"),
+                                "image_type": image_type,
+                                "description": description,
                             }
 
-                            # Extract annotation if available
-                            if "image_annotation" in image and image["image_annotation"]:
-                                ann = image["image_annotation"]
-                                if isinstance(ann, str):
-                                    try:
-                                        ann = json.loads(ann)
-                                    except:
-                                        pass
-                                
-                                if isinstance(ann, dict):
-                                    annotation_info.update({
-                                        "image_type": ann.get("image_type"),
-                                        "description": ann.get("description")
-                                    })
-                                else:
-                                    annotation_info.update({"image_type": "unknown", "description": str(ann)})
-                            else:
-                                annotation_info.update({"image_type": "unknown", "description": "No annotation available"})
-
-                            image_descriptions.append(annotation_info)
-                            image_count += 1
+                            pending_writes.append((write, image_id, filename, annotation_info))
                         except Exception as e:
                             logging.error(f"Error processing image {image.get('id', 'unknown')}: {e}")
 
-    descriptions_path = os.path.join(output_dir, "image_descriptions.json")
-    with open(descriptions_path, 'w') as f:
-        json.dump(image_descriptions, f, indent=2)
+    for write, image_id, filename, annotation_info in pending_writes:
+        try:
+            image_sizes[filename] = write.result()
+        except Exception as e:
+            logging.error(f"Error processing image {image_id}: {e}")
+            continue
+        logging.info(f"Saved image: {filename} to {output_dir}")
+        image_descriptions.append(annotation_info)
+        image_count += 1
+
+    (out_dir / "image_descriptions.json").write_bytes(orjson.dumps(image_descriptions, option=orjson.OPT_INDENT_2))
+    if source_key is not None:
+        manifest = {"source": source_key, "images": image_sizes}
+        (out_dir / IMAGE_MANIFEST_NAME).write_bytes(orjson.dumps(manifest))
 
     return image_count
 
-async def run_convert_stage(listing_name: str):
+def _file_sha256(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _ocr_request_signature() -> str:
+    # Cached OCR is only valid for the request that produced it: model, image annotation
+    # schema, page-range size, and OCR_CACHE_VERSION for changes to how responses are merged.
+    request = {
+        "version": OCR_CACHE_VERSION,
+        "model": OCR_MODEL,
+        "annotation_schema": ImageAnnotation.model_json_schema(),
+        "pages_per_request": PAGES_PER_REQUEST,
+    }
+    return hashlib.sha256(orjson.dumps(request, option=orjson.OPT_SORT_KEYS)).hexdigest()[:16]
+
+
+def _ocr_cache_path(pdf_path: Path) -> Path:
+    """
+    Content-addressed cache location for a PDF's full OCR response (images included),
+    so an unchanged PDF is never sent to Mistral twice, whichever listing it is in.
+    """
+    return Path(OCR_CACHE_DIR) / OCR_MODEL / _ocr_request_signature() / f"{_file_sha256(pdf_path)}.json"
+
+
+def _excel_cache_path(excel_path: Path) -> Path:
+    """
+    Content-addressed cache location for a workbook's converted markdown, under the
+    excel_processor CONVERTER_VERSION that produced it.
+    """
+    return Path(OCR_CACHE_DIR) / "excel" / f"v{CONVERTER_VERSION}" / f"{_file_sha256(excel_path)}.md"
+
+
+def _store_cache(cache_path: Path, source) -> None:
+    """Writes a cache entry atomically: an OCR response dict, or a copy of the file at `source`."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if isinstance(source, dict):
+                f.write(orjson.dumps(source))
+            else:
+                with open(source, "rb") as src:
+                    shutil.copyfileobj(src, f)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+async def run_convert_stage(listing_name: str, ocr_semaphore: Optional[asyncio.Semaphore] = None):
     """
     Stage 1 conversion for a listing:
     Converts source docs to markdown and writes a consolidated artifact.
+
+    ocr_semaphore caps in-flight per-file OCR requests (OCR_CONCURRENCY by default),
+    so a large listing queues instead of overloading Mistral; pass one semaphore to
+    every run to share the cap across listings converted together.
     """
     # Convert listing name to capitalized for directory
     listing_dir = get_listing_dir(listing_name)
@@ -169,10 +381,38 @@ async def run_convert_stage(listing_name: str):
     temp_dir.mkdir(parents=True, exist_ok=True)
     
     logging.info(f"📁 Processing {len(process_files)} files in parallel for {listing_name}...")
+    if ocr_semaphore is None:
+        ocr_semaphore = asyncio.Semaphore(OCR_CONCURRENCY)
+
+    # PDFs whose OCR is already cached (by content hash) skip Mistral entirely.
+    pdf_files = [f for f in process_files if f.suffix.lower() == ".pdf"]
+    ocr_cache_paths = dict(zip(pdf_files, await asyncio.gather(
+        *(asyncio.to_thread(_ocr_cache_path, f) for f in pdf_files)
+    )))
+    cached_pdfs = {f for f in pdf_files if ocr_cache_paths[f].exists()}
+    if cached_pdfs:
+        logging.info(f"♻️ Reusing cached OCR for {len(cached_pdfs)} of {len(pdf_files)} PDFs.")
+
+    # When enabled, OCR multiple PDFs as one batch job up front; anything the batch
+    # misses (or a batch that times out) falls back to per-file OCR.
+    ocr_pdfs = [f for f in pdf_files if f not in cached_pdfs]
+    batched_pdfs = set()
+    if OCR_BATCH_ENABLED and len(ocr_pdfs) >= OCR_BATCH_MIN_FILES:
+        try:
+            batched = await asyncio.to_thread(
+                ocr_batch,
+                [str(f) for f in ocr_pdfs],
+                [str(temp_dir / f"{f.stem}_ocr.json") for f in ocr_pdfs],
+                max_wait=OCR_BATCH_MAX_WAIT,
+            )
+            batched_pdfs = {Path(p) for p in batched}
+        except Exception as e:
+            logging.error(f"OCR batch failed, falling back to per-file OCR: {e}")
 
     async def process_file(doc_path: Path):
         ext = doc_path.suffix.lower()
-        file_md = ""
+        # Markdown for this file stays on disk; it is copied into the consolidated file at the end
+        file_md: Optional[Path] = None
         logging.info(f"🔍 Starting: {doc_path.name}")
 
         try:
@@ -182,45 +422,69 @@ async def run_convert_stage(listing_name: str):
                 # Store images in a per-file subdirectory
                 file_images_dir = images_dir / doc_path.stem
                 
-                # Run OCR in a separate thread
-                await asyncio.to_thread(ocr_with_mistral, str(doc_path), str(temp_json))
-                await asyncio.to_thread(parse_and_save_markdown, str(temp_json), str(temp_md))
-                await asyncio.to_thread(extract_images_from_ocr, str(temp_json), str(file_images_dir))
-                
-                with open(temp_md, 'r') as f:
-                    file_md = f.read()
+                # Run OCR on the async client unless the cache or the batch already produced it.
+                # A fresh response is handed on in memory; the JSON on disk is kept for reference.
+                cache_path = ocr_cache_paths[doc_path]
+                if doc_path in cached_pdfs:
+                    ocr_source = str(cache_path)
+                else:
+                    if doc_path in batched_pdfs:
+                        ocr_source = str(temp_json)
+                    else:
+                        async with ocr_semaphore:
+                            ocr_response = await ocr_with_mistral_async(str(doc_path), str(temp_json), client=ocr_client)
+                        ocr_source = ocr_response.model_dump()
+                    try:
+                        await asyncio.to_thread(_store_cache, cache_path, ocr_source)
+                    except (OSError, TypeError) as e:
+                        logging.warning(f"Could not cache OCR for {doc_path.name}: {e}")
+                source_key = cache_path.relative_to(OCR_CACHE_DIR).as_posix()
+                await asyncio.to_thread(consume_ocr, ocr_source, str(temp_md), str(file_images_dir), source_key)
+                file_md = temp_md
 
             elif ext in [".xlsx", ".xls"]:
                 temp_md = temp_dir / f"{doc_path.stem}.md"
-                await asyncio.to_thread(process_excel_to_markdown, str(doc_path), str(temp_md))
-                with open(temp_md, 'r') as f:
-                    file_md = f.read()
+                cache_path = await asyncio.to_thread(_excel_cache_path, doc_path)
+                if cache_path.exists():
+                    logging.info(f"♻️ Reusing cached markdown for {doc_path.name}")
+                    await asyncio.to_thread(shutil.copyfile, cache_path, temp_md)
+                else:
+                    await asyncio.to_thread(process_excel_to_markdown, str(doc_path), str(temp_md))
+                    try:
+                        await asyncio.to_thread(_store_cache, cache_path, str(temp_md))
+                    except OSError as e:
+                        logging.warning(f"Could not cache markdown for {doc_path.name}: {e}")
+                file_md = temp_md
 
             elif ext == ".md":
-                # Supplemental markdown (e.g., sponsor emails, notes) — read directly
-                with open(doc_path, 'r') as f:
-                    file_md = f.read()
+                # Supplemental markdown (e.g., sponsor emails, notes) — used as is
+                file_md = doc_path
 
-            if file_md:
+            if file_md is not None and file_md.stat().st_size:
                 header = f"\n\n{'='*40}\n"
                 header += f"SOURCE FILE: {doc_path.name}\n"
                 header += f"{'='*40}\n\n"
-                return header + file_md
+                return header, file_md
             
         except Exception as e:
             logging.error(f"Error processing {doc_path.name}: {e}")
         
-        return ""
+        return None
 
-    # Process all files in parallel
-    results = await asyncio.gather(*(process_file(f) for f in process_files))
+    # Process all files in parallel, sharing one pooled OCR client that is closed when they finish
+    async with async_ocr_client() as ocr_client:
+        results = await asyncio.gather(*(process_file(f) for f in process_files))
     
-    consolidated_markdown = [f"# Listing Context: {listing_name}\n\n"]
-    consolidated_markdown.extend([r for r in results if r])
-
-    # Save the grand consolidated markdown
-    with open(markdown_path, 'w') as f:
-        f.write("".join(consolidated_markdown))
+    # Save the grand consolidated markdown, streaming each file's markdown in from disk
+    with open(markdown_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(f"# Listing Context: {listing_name}\n\n")
+        for result in results:
+            if result is None:
+                continue
+            header, file_md = result
+            f.write(header)
+            with open(file_md, 'r', encoding='utf-8') as src:
+                shutil.copyfileobj(src, f, 1 << 20)
 
     logging.info(f"🚀 CONSOLIDATION COMPLETE for {listing_name}!")
     logging.info(f"Final Consolidated Markdown: {markdown_path}")
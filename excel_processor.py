@@ -1,6 +1,129 @@
+import numpy as np
 import pandas as pd
 import logging
 from pathlib import Path
+from openpyxl import load_workbook
+
+# Bump when a change alters the markdown produced for the same workbook, so the
+# convert stage's cached conversions from older versions are not reused
+CONVERTER_VERSION = 1
+
+# Formats openpyxl can open directly; anything else (.xls) goes through pandas
+OPENPYXL_EXTS = (".xlsx", ".xlsm")
+
+# pd.read_excel's default na_values, so placeholder text behaves the same way
+NA_STRINGS = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+]
+
+def _header(row: tuple) -> list:
+    """Mirror pandas' header handling: blank → 'Unnamed: i', repeats → 'name.1'."""
+    seen = {}
+    names = []
+    for i, name in enumerate(row):
+        if name is None or name == "":
+            name = f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def _read_sheets(excel_path: str) -> dict:
+    """
+    Read every sheet into a DataFrame (first row as header).
+
+    .xlsx/.xlsm workbooks are streamed with openpyxl in read-only mode and
+    plain cell values, skipping pandas' per-cell conversion and type-inference
+    passes. Other formats fall back to pd.read_excel.
+    """
+    if Path(excel_path).suffix.lower() not in OPENPYXL_EXTS:
+        return pd.read_excel(excel_path, sheet_name=None)
+
+    wb = load_workbook(excel_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheets = {}
+        for ws in wb.worksheets:
+            # Dimensions recorded in the file can be stale; recompute while reading
+            ws.reset_dimensions()
+            rows = list(ws.iter_rows(values_only=True))
+            if not rows:
+                sheets[ws.title] = pd.DataFrame()
+                continue
+            width = max(len(r) for r in rows)
+            rows = [r + (None,) * (width - len(r)) for r in rows]
+            df = pd.DataFrame(rows[1:], columns=_header(rows[0]))
+            sheets[ws.title] = df.mask(df.isin(NA_STRINGS)).infer_objects()
+        return sheets
+    finally:
+        wb.close()
+
+def _md_cell(value) -> str:
+    # Whole-number floats print as integers (as tabulate did); every cell is
+    # kept on one line and inside its own column
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+def _ffill_rows(arr: np.ndarray) -> np.ndarray:
+    """
+    Row-wise forward fill of an object grid, then blanks for anything still
+    missing — one pass instead of ffill(axis=1) followed by fillna("").
+    """
+    mask = pd.isna(arr)
+    # For each cell, the column index of the nearest non-missing cell at or to
+    # its left (0 when there is none; that cell is missing and becomes "")
+    idx = np.where(~mask, np.arange(arr.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    rows = np.arange(arr.shape[0])[:, None]
+    out = arr[rows, idx]
+    # Gather the mask the same way rather than re-running pd.isna on objects
+    out[mask[rows, idx]] = ""
+    return out
+
+def _grid_to_pipe_md(columns, grid: np.ndarray) -> str:
+    """
+    Renders a header + object grid as a Markdown pipe table without tabulate's
+    column-width pass and per-cell formatting (no padding or alignment).
+    """
+    header = "| " + " | ".join(_md_cell(c) for c in columns) + " |"
+    separator = "|" + "---|" * len(columns)
+    rows = [
+        "| " + " | ".join(_md_cell(v) for v in row) + " |"
+        for row in grid
+    ]
+    return "\n".join([header, separator, *rows])
+
+def _render_sheet(sheet_name: str, df: pd.DataFrame) -> str:
+    """
+    Runs the cleanup ritual on one sheet and renders it as a Markdown grid.
+    """
+    # --- The Cleanup Ritual ---
+    
+    # 1. Strip edge emptiness (Rows & Columns)
+    df = df.dropna(how='all', axis=0).dropna(how='all', axis=1)
+    
+    # 2. Handle Merged Cells (Basic version)
+    # Forward fill allows orphaned data to find its parent header
+    # We only ffill if it makes sense (usually horizontal headers)
+    # 3. Clean NaN/Nulls for the LLM
+    # (both done in a single pass over the raw object grid)
+    grid = _ffill_rows(df.to_numpy(dtype=object))
+    
+    # 4. Generate the Compressed Grid
+    # Prepend Sheet name so Gemini knows the specific context
+    sheet_content = f"### EXTERNAL DATA SOURCE: Excel Sheet - {sheet_name}\n\n"
+    
+    if grid.size:
+        sheet_content += _grid_to_pipe_md(df.columns, grid)
+    else:
+        sheet_content += "*[Sheet was found but contained no structured data]*"
+        
+    return sheet_content
 
 def process_excel_to_markdown(excel_path: str, output_markdown_path: str):
     """
@@ -13,11 +136,10 @@ def process_excel_to_markdown(excel_path: str, output_markdown_path: str):
     logging.info(f"🚀 Starting Excel processing for: {excel_path}")
     
     try:
-        # Read all sheets (sheet_name=None returns a dict)
-        sheets_dict = pd.read_excel(excel_path, sheet_name=None)
-        
-        full_markdown = []
+        # Read all sheets (sheet name → DataFrame)
+        sheets_dict = _read_sheets(excel_path)
         
+        sheets = []
         for sheet_name, df in sheets_dict.items():
             # Skip empty sheets
             if df.empty:
@@ -25,37 +147,18 @@ def process_excel_to_markdown(excel_path: str, output_markdown_path: str):
                 continue
                 
             logging.info(f"📄 Processing sheet: {sheet_name} ({len(df)} rows found)")
-            
-            # --- The Cleanup Ritual ---
-            
-            # 1. Strip edge emptiness (Rows & Columns)
-            df = df.dropna(how='all', axis=0).dropna(how='all', axis=1)
-            
-            # 2. Handle Merged Cells (Basic version)
-            # Forward fill allows orphaned data to find its parent header
-            # We only ffill if it makes sense (usually horizontal headers)
-            df = df.ffill(axis=1) 
-            
-            # 3. Clean NaN/Nulls for the LLM
-            df = df.fillna("")
-            
-            # 4. Generate the Compressed Grid
-            # Prepend Sheet name so Gemini knows the specific context
-            sheet_content = f"### EXTERNAL DATA SOURCE: Excel Sheet - {sheet_name}\n\n"
-            
-            if not df.empty:
-                sheet_content += df.to_markdown(index=False)
-            else:
-                sheet_content += "*[Sheet was found but contained no structured data]*"
-                
-            full_markdown.append(sheet_content)
-            
-        # Join all sheets with a separator
-        final_content = "\n\n" + "\n\n---\n\n".join(full_markdown) + "\n\n"
+            sheets.append((sheet_name, df))
         
-        # Save to the same location the pipeline expects markdown
-        with open(output_markdown_path, 'w') as f:
-            f.write(final_content)
+        # Save to the same location the pipeline expects markdown, with all
+        # sheets joined by a separator. Each sheet is written as soon as it is
+        # rendered, so only one sheet's markdown is held in memory at a time.
+        with open(output_markdown_path, 'w', encoding='utf-8') as f:
+            f.write("\n\n")
+            for i, (sheet_name, df) in enumerate(sheets):
+                if i:
+                    f.write("\n\n---\n\n")
+                f.write(_render_sheet(sheet_name, df))
+            f.write("\n\n")
             
         logging.info(f"✅ Excel conversion successful. Markdown saved to: {output_markdown_path}")
         return True
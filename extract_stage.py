@@ -1,8 +1,8 @@
 import os
 import sys
-import json
 import asyncio
 import logging
+import orjson
 from pathlib import Path
 import argparse
 from typing import Dict, List
@@ -18,6 +18,7 @@ from src.agents.agents import (
     MarketAgent,
     SponsorAgent
 )
+from src.agents.preprocess import compact
 from src.config import EXTRACTION_MODEL
 from src.pipeline.extraction_cache import (
     sanitize_model_name,
@@ -96,19 +97,70 @@ def _listing_output_path(markdown_path: str) -> str:
     )
 
 
-def build_detail_page(title, subtitle, sections_data):
-    page_sections = []
-    for s_type, s_data in sections_data:
-        if s_data:
-            page_sections.append(to_block(s_type, s_data))
+def build_sections(data, sections):
+    """Blocks for each (block type, attribute) in sections whose value on data is non-empty."""
+    return [to_block(s_type, value) for s_type, attr in sections if (value := getattr(data, attr))]
+
+
+def build_detail_page(title, subtitle, data, sections):
     return {
         "pageTitle": title,
         "pageSubtitle": subtitle,
         "backgroundImages": [],
-        "sections": page_sections
+        "sections": build_sections(data, sections)
     }
 
 
+# (block type, agent output attribute) for each section, in page order
+OVERVIEW_SECTIONS = (
+    ("hero", "hero"),
+    ("tickerMetrics", "tickerMetrics"),
+    ("compellingReasons", "compellingReasons"),
+    ("executiveSummary", "executiveSummary"),
+    ("investmentCards", "investmentCards"),
+)
+FINANCIAL_SECTIONS = (
+    ("projections", "projections"),
+    ("capitalStack", "capitalStack"),
+    ("distributionTimeline", "timeline"),
+    ("taxBenefits", "taxBenefits"),
+    ("investmentStructure", "structure"),
+    ("distributionWaterfall", "waterfall"),
+)
+PROPERTY_SECTIONS = (
+    ("keyFacts", "keyFacts"),
+    ("amenities", "amenities"),
+    ("unitMix", "unitMix"),
+    ("locationHighlights", "locationHighlights"),
+    ("locationFeatures", "locationFeatures"),
+    ("developmentTimeline", "timeline"),
+    ("developmentPhases", "phases"),
+)
+MARKET_SECTIONS = (
+    ("marketMetrics", "metrics"),
+    ("majorEmployers", "employers"),
+    ("demographics", "demographics"),
+    ("keyMarketDrivers", "drivers"),
+    ("supplyDemand", "supplyDemand"),
+    ("competitiveAnalysis", "competitors"),
+    ("economicDiversification", "diversification"),
+)
+SPONSOR_SECTIONS = (
+    ("sponsorIntro", "intro"),
+    ("partnershipOverview", "partnership"),
+    ("trackRecord", "trackRecord"),
+    ("leadershipTeam", "team"),
+    ("keyDevelopmentPartners", "keyPartners"),
+    ("competitiveAdvantages", "advantages"),
+)
+PORTFOLIO_SECTIONS = (("projectOverview", "portfolio"),)
+FUND_STRUCTURE_SECTIONS = (
+    ("fundSponsorEntities", "fundEntities"),
+    ("fundDetails", "fundDetails"),
+)
+PARTICIPATION_SECTIONS = (("participationSteps", "participationSteps"),)
+
+
 async def run_pipeline(markdown_path: str, agent_filter: str = None, no_cache: bool = False):
     listing_dir = Path(markdown_path).parent
     if not listing_dir.exists():
@@ -122,8 +174,7 @@ async def run_pipeline(markdown_path: str, agent_filter: str = None, no_cache: b
         return None
 
     logging.info(f"Loading manifest: {manifest_path}")
-    with manifest_path.open("r") as f:
-        manifest = json.load(f)
+    manifest = orjson.loads(manifest_path.read_bytes())
 
     file_entries = manifest.get("files", [])
     if not file_entries:
@@ -139,8 +190,7 @@ async def run_pipeline(markdown_path: str, agent_filter: str = None, no_cache: b
             logging.error(f"Missing bucketed temp markdown for {fname}: {temp_path}")
             return None
         try:
-            with temp_path.open("r") as f:
-                per_file_markdowns[fname] = f.read()
+            per_file_markdowns[fname] = compact(temp_path.read_text(encoding="utf-8"))
         except Exception as e:
             logging.error(f"Failed reading markdown for {fname}: {e}")
             return None
@@ -280,15 +330,9 @@ async def run_pipeline(markdown_path: str, agent_filter: str = None, no_cache: b
         if not overview_data:
             logging.error("Overview output missing.")
             return None
-        sections = [
-            to_block("hero", overview_data.hero),
-            to_block("tickerMetrics", overview_data.tickerMetrics),
-            to_block("compellingReasons", overview_data.compellingReasons),
-            to_block("executiveSummary", overview_data.executiveSummary),
-            to_block("investmentCards", overview_data.investmentCards)
-        ]
+        # Overview blocks are always emitted, even when empty
         final_listing["listingName"] = overview_data.hero.listingName
-        final_listing["sections"] = sections
+        final_listing["sections"] = [to_block(s_type, getattr(overview_data, attr)) for s_type, attr in OVERVIEW_SECTIONS]
         final_listing["newsLinks"] = to_dict(overview_data.newsLinks) if overview_data.newsLinks else []
 
     if "financial" in agents_to_run:
@@ -298,14 +342,8 @@ async def run_pipeline(markdown_path: str, agent_filter: str = None, no_cache: b
         final_listing.setdefault("details", {})["financialReturns"] = build_detail_page(
             "Financial Returns",
             "Detailed financial projections and investment structure",
-            [
-                ("projections", financial_data.projections),
-                ("capitalStack", financial_data.capitalStack),
-                ("distributionTimeline", financial_data.timeline),
-                ("taxBenefits", financial_data.taxBenefits),
-                ("investmentStructure", financial_data.structure),
-                ("distributionWaterfall", financial_data.waterfall)
-            ]
+            financial_data,
+            FINANCIAL_SECTIONS,
         )
 
     if "property" in agents_to_run:
@@ -315,15 +353,8 @@ async def run_pipeline(markdown_path: str, agent_filter: str = None, no_cache: b
         final_listing.setdefault("details", {})["propertyOverview"] = build_detail_page(
             "Property Overview",
             "Physical asset details and site characteristics",
-            [
-                ("keyFacts", property_data.keyFacts),
-                ("amenities", property_data.amenities),
-                ("unitMix", property_data.unitMix),
-                ("locationHighlights", property_data.locationHighlights),
-                ("locationFeatures", property_data.locationFeatures),
-                ("developmentTimeline", property_data.timeline),
-                ("developmentPhases", property_data.phases)
-            ]
+            property_data,
+            PROPERTY_SECTIONS,
         )
 
     if "market" in agents_to_run:
@@ -333,15 +364,8 @@ async def run_pipeline(markdown_path: str, agent_filter: str = None, no_cache: b
         final_listing.setdefault("details", {})["marketAnalysis"] = build_detail_page(
             "Market Analysis",
             "Local economic drivers and competitive landscape",
-            [
-                ("marketMetrics", market_data.metrics),
-                ("majorEmployers", market_data.employers),
-                ("demographics", market_data.demographics),
-                ("keyMarketDrivers", market_data.drivers),
-                ("supplyDemand", market_data.supplyDemand),
-                ("competitiveAnalysis", market_data.competitors),
-                ("economicDiversification", market_data.diversification)
-            ]
+            market_data,
+            MARKET_SECTIONS,
         )
 
     if "sponsor" in agents_to_run:
@@ -350,45 +374,36 @@ async def run_pipeline(markdown_path: str, agent_filter: str = None, no_cache: b
             return None
         final_listing.setdefault("details", {})["sponsorProfile"] = {
             "sponsorName": sponsor_data.intro.sponsorName if sponsor_data.intro else "Sponsor Profile",
-            "sections": [
-                to_block(t, d) for t, d in [
-                    ("sponsorIntro", sponsor_data.intro),
-                    ("partnershipOverview", sponsor_data.partnership),
-                    ("trackRecord", sponsor_data.trackRecord),
-                    ("leadershipTeam", sponsor_data.team),
-                    ("keyDevelopmentPartners", sponsor_data.keyPartners),
-                    ("competitiveAdvantages", sponsor_data.advantages)
-                ] if d
-            ]
+            "sections": build_sections(sponsor_data, SPONSOR_SECTIONS)
         }
 
         if sponsor_data.portfolio:
             final_listing["details"]["portfolioProjects"] = build_detail_page(
                 "Portfolio Projects",
                 "Overview of the assets currently in the portfolio",
-                [("projectOverview", sponsor_data.portfolio)]
+                sponsor_data,
+                PORTFOLIO_SECTIONS,
             )
         if sponsor_data.fundEntities or sponsor_data.fundDetails:
             final_listing["details"]["fundStructure"] = build_detail_page(
                 "Fund Structure",
                 "Entity structure and legal framework of the fund",
-                [
-                    ("fundSponsorEntities", sponsor_data.fundEntities),
-                    ("fundDetails", sponsor_data.fundDetails)
-                ]
+                sponsor_data,
+                FUND_STRUCTURE_SECTIONS,
             )
         if sponsor_data.participationSteps:
             final_listing["details"]["howInvestorsParticipate"] = build_detail_page(
                 "How to Participate",
                 "Next steps for qualified investors",
-                [("participationSteps", sponsor_data.participationSteps)]
+                sponsor_data,
+                PARTICIPATION_SECTIONS,
             )
 
     # Ensure output directory exists.
     output_path = _listing_output_path(markdown_path)
 
-    with open(output_path, 'w') as f:
-        json.dump(final_listing, f, indent=2)
+    with open(output_path, 'wb') as f:
+        f.write(orjson.dumps(final_listing, option=orjson.OPT_INDENT_2))
 
     logging.info(f"Pipeline complete. Output saved to: {output_path}")
     return output_path
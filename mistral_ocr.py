@@ -1,9 +1,18 @@
 import os
-import json
+import time
+import asyncio
 import logging
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import httpx
+import ijson
+import orjson
 from mistralai import Mistral
+from mistralai.models import OCRResponse, OCRUsageInfo
 from mistralai.extra import response_format_from_pydantic_model
+from mistralai.utils import BackoffStrategy, RetryConfig
 from pydantic import BaseModel, Field
+from pypdf import PdfReader
 from dotenv import load_dotenv
 
 # Set up logging
@@ -11,76 +20,347 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 
 load_dotenv()
 
+# Resolved once at import (after .env is loaded); checked lazily by _require_api_key.
+MISTRAL_API_KEY = os.environ.get("MISTRAL_API_KEY")
+
+OCR_MODEL = "mistral-ocr-latest"
+# Part of the convert stage's OCR cache key: bump when a change here alters the saved
+# response for the same PDF (e.g. the page-range split/merge) to retire cached entries.
+OCR_CACHE_VERSION = 1
+BATCH_POLL_INTERVAL = 2
+BATCH_MAX_WAIT = 15 * 60  # seconds; a batch still pending after this is cancelled
+_BATCH_PENDING = {"QUEUED", "RUNNING"}
+PAGES_PER_REQUEST = 8  # long PDFs are OCR'd as concurrent page-range requests of this size
+MAX_PAGE_REQUESTS = 4  # concurrent page-range requests per document
+_IMAGE_BASE64_FIELDS = {"pages": {"__all__": {"images": {"__all__": {"image_base64"}}}}}
+SIGNED_URL_EXPIRY_HOURS = 24
+SIGNED_URL_REFRESH_MARGIN = 300  # seconds; re-upload rather than hand out a URL about to expire
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE = 20
+# Retry 429/5xx responses and connection errors with jittered exponential backoff
+# (1s, 2s, 4s, ... capped at 30s per wait, giving up after 2 minutes) so a transient
+# overload does not drop a whole document. The SDK also honors Retry-After.
+RETRY_CONFIG = RetryConfig(
+    "backoff",
+    BackoffStrategy(initial_interval=1000, max_interval=30000, exponent=2, max_elapsed_time=120000),
+    retry_connection_errors=True,
+)
+
 # 1. Define the schema for image descriptions
 class ImageAnnotation(BaseModel):
     image_type: str = Field(..., description="Type of image: chart, table, or photo")
     description: str = Field(..., description="A 1-sentence description of the image content")
 
-def ocr_with_mistral(file_path: str, output_path: str = "ocr_output.json"):
+@lru_cache(maxsize=None)
+def _annotation_format():
+    """The ImageAnnotation response format, built once and shared by per-file and batch requests."""
+    return response_format_from_pydantic_model(ImageAnnotation)
+
+@lru_cache(maxsize=None)
+def _get_client(api_key: str) -> Mistral:
     """
-    Performs OCR on a PDF file using the Mistral API with image annotations.
+    Returns a process-wide Mistral client per API key, backed by a pooled HTTP/2
+    connection so upload, signed-URL and OCR calls reuse warm connections.
+    """
+    http_client = httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE),
+        follow_redirects=True,
+    )
+    return Mistral(api_key=api_key, client=http_client, retry_config=RETRY_CONFIG)
 
-    Args:
-        file_path (str): The path to the PDF file.
-        output_path (str): The path to save the OCR results.
+@asynccontextmanager
+async def async_ocr_client():
+    """
+    Async counterpart of _get_client, scoped to one run of OCR calls instead of the
+    process: httpx.AsyncClient pools are bound to the event loop they were created
+    on, so the pool is closed on exit rather than left behind with its loop.
     """
-    api_key = os.environ.get("MISTRAL_API_KEY")
-    if not api_key:
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE),
+        follow_redirects=True,
+    )
+    try:
+        yield Mistral(api_key=MISTRAL_API_KEY, async_client=http_client, retry_config=RETRY_CONFIG)
+    finally:
+        await http_client.aclose()
+
+def _require_api_key() -> str:
+    if not MISTRAL_API_KEY:
         raise ValueError("MISTRAL_API_KEY environment variable not set.")
+    return MISTRAL_API_KEY
+
+# (api_key, path, size, mtime) -> (signed URL, monotonic expiry)
+_signed_urls: dict[tuple, tuple[str, float]] = {}
+
+def _upload_key(api_key: str, file_path: str) -> tuple:
+    stat = os.stat(file_path)
+    return (api_key, os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+def _cached_signed_url(key: tuple) -> str | None:
+    cached = _signed_urls.get(key)
+    if cached and time.monotonic() < cached[1]:
+        logging.info(f"Reusing uploaded file for {key[1]}")
+        return cached[0]
+    return None
+
+def _remember_signed_url(key: tuple, url: str) -> None:
+    _signed_urls[key] = (url, time.monotonic() + SIGNED_URL_EXPIRY_HOURS * 3600 - SIGNED_URL_REFRESH_MARGIN)
 
-    client = Mistral(api_key=api_key)
+def _signed_document_url(api_key: str, file_path: str) -> str:
+    """
+    Uploads a PDF for OCR and returns a signed URL for it. While that URL is still
+    valid, later calls for the same unchanged file (e.g. a per-file retry after a
+    batch failure) reuse it instead of uploading again.
+    """
+    key = _upload_key(api_key, file_path)
+    cached = _cached_signed_url(key)
+    if cached:
+        return cached
 
-    # 1. Upload the file
+    client = _get_client(api_key)
     logging.info(f"Uploading file: {file_path}")
     with open(file_path, "rb") as f:
         uploaded_pdf = client.files.upload(
             file={"file_name": os.path.basename(file_path), "content": f},
             purpose="ocr"
         )
+    # The upload response already carries the file id; no separate retrieve round-trip
+    logging.info(f"Uploaded file: {uploaded_pdf.id}")
 
-    # 2. Retrieve the file to confirm upload
-    retrieved_file = client.files.retrieve(file_id=uploaded_pdf.id)
-    logging.info(f"Retrieved file: {retrieved_file.id}")
+    signed_url = client.files.get_signed_url(file_id=uploaded_pdf.id, expiry=SIGNED_URL_EXPIRY_HOURS)
+    _remember_signed_url(key, signed_url.url)
+    return signed_url.url
 
-    # 3. Get a signed URL for the file
-    signed_url = client.files.get_signed_url(file_id=uploaded_pdf.id)
+async def _signed_document_url_async(client: Mistral, api_key: str, file_path: str) -> str:
+    """Async version of _signed_document_url; shares the same upload cache."""
+    key = _upload_key(api_key, file_path)
+    cached = _cached_signed_url(key)
+    if cached:
+        return cached
 
-    # 4. Get OCR results with image annotations
-    annotation_format = response_format_from_pydantic_model(ImageAnnotation)
+    logging.info(f"Uploading file: {file_path}")
+    with open(file_path, "rb") as f:
+        uploaded_pdf = await client.files.upload_async(
+            file={"file_name": os.path.basename(file_path), "content": f},
+            purpose="ocr"
+        )
+    logging.info(f"Uploaded file: {uploaded_pdf.id}")
 
-    logging.info("Starting Mistral OCR processing...")
-    ocr_response = client.ocr.process(
-        model="mistral-ocr-latest",
-        document={
+    signed_url = await client.files.get_signed_url_async(file_id=uploaded_pdf.id, expiry=SIGNED_URL_EXPIRY_HOURS)
+    _remember_signed_url(key, signed_url.url)
+    return signed_url.url
+
+def _ocr_request(document_url: str) -> dict:
+    return {
+        "model": OCR_MODEL,
+        "document": {
             "type": "document_url",
-            "document_url": signed_url.url,
+            "document_url": document_url,
         },
-        include_image_base64=True,
-        bbox_annotation_format=annotation_format
+        "include_image_base64": True,
+        "bbox_annotation_format": _annotation_format(),
+    }
+
+def _page_count(file_path: str) -> int:
+    try:
+        return len(PdfReader(file_path).pages)
+    except Exception as e:
+        logging.warning(f"Could not read page count of {file_path}, OCR'ing it in one request: {e}")
+        return 0
+
+def _merge_ocr_responses(responses: list[OCRResponse]) -> OCRResponse:
+    """
+    Concatenates the responses for consecutive page ranges of one document. Image ids
+    are only unique within a response, so a repeated id is prefixed with its page
+    index and the page's markdown link to it is updated to match.
+    """
+    pages = []
+    seen_ids = set()
+    for response in responses:
+        for page in response.pages:
+            for image in page.images:
+                if image.id in seen_ids:
+                    new_id = f"p{page.index}-{image.id}"
+                    page.markdown = page.markdown.replace(f"]({image.id})", f"]({new_id})")
+                    image.id = new_id
+                seen_ids.add(image.id)
+            pages.append(page)
+
+    first = responses[0]
+    return OCRResponse(
+        pages=pages,
+        model=first.model,
+        usage_info=OCRUsageInfo(
+            pages_processed=sum(r.usage_info.pages_processed for r in responses),
+            doc_size_bytes=first.usage_info.doc_size_bytes,
+        ),
+        document_annotation=first.document_annotation,
     )
 
-    with open(output_path, "w") as f:
-        json.dump(ocr_response.dict(), f, indent=4)
+def _save_ocr_response(ocr_response, output_path: str, keep_image_base64: bool) -> None:
+    # Serialize straight from the response model; avoids building an intermediate dict of every base64 image.
+    exclude = None if keep_image_base64 else _IMAGE_BASE64_FIELDS
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(ocr_response.model_dump_json(exclude=exclude))
 
     logging.info(f"OCR results saved to {output_path}")
 
+def ocr_with_mistral(file_path: str, output_path: str = "ocr_output.json", keep_image_base64: bool = False):
+    """
+    Performs OCR on a PDF file using the Mistral API with image annotations.
+
+    Args:
+        file_path (str): The path to the PDF file.
+        output_path (str): The path to save the OCR results.
+        keep_image_base64 (bool): Keep the base64 image payloads in the saved JSON.
+            Off by default; extract images from the returned response instead.
+    """
+    api_key = _require_api_key()
+    client = _get_client(api_key)
+
+    # 1-3. Upload the file and get a signed URL for it (reused if this file was already uploaded)
+    document_url = _signed_document_url(api_key, file_path)
+
+    # 4. Get OCR results with image annotations
+    logging.info("Starting Mistral OCR processing...")
+    ocr_response = client.ocr.process(**_ocr_request(document_url))
+
+    _save_ocr_response(ocr_response, output_path, keep_image_base64)
+    return ocr_response
+
+async def ocr_with_mistral_async(
+    file_path: str,
+    output_path: str = "ocr_output.json",
+    keep_image_base64: bool = False,
+    pages_per_request: int = PAGES_PER_REQUEST,
+    client: Mistral | None = None,
+):
+    """
+    Async version of ocr_with_mistral for use inside the event loop: the upload,
+    signed-URL and OCR requests are awaited on a pooled async HTTP client instead
+    of holding a worker thread each. Pass the client from async_ocr_client() to
+    share its connections across files; without one, a client is opened for this
+    call only.
+
+    PDFs longer than pages_per_request pages are OCR'd as page-range requests
+    against the same upload (up to MAX_PAGE_REQUESTS at a time) and merged back
+    into a single response in page order.
+    """
+    api_key = _require_api_key()
+    if client is None:
+        async with async_ocr_client() as client:
+            return await ocr_with_mistral_async(file_path, output_path, keep_image_base64, pages_per_request, client)
+
+    document_url = await _signed_document_url_async(client, api_key, file_path)
+    page_count = await asyncio.to_thread(_page_count, file_path) if pages_per_request else 0
+
+    if page_count > pages_per_request:
+        page_ranges = [list(range(start, min(start + pages_per_request, page_count)))
+                       for start in range(0, page_count, pages_per_request)]
+        logging.info(f"Starting Mistral OCR processing of {page_count} pages in {len(page_ranges)} requests...")
+        semaphore = asyncio.Semaphore(MAX_PAGE_REQUESTS)
+
+        async def process_range(pages: list[int]) -> OCRResponse:
+            async with semaphore:
+                return await client.ocr.process_async(**_ocr_request(document_url), pages=pages)
+
+        ocr_response = _merge_ocr_responses(await asyncio.gather(*(process_range(r) for r in page_ranges)))
+    else:
+        logging.info("Starting Mistral OCR processing...")
+        ocr_response = await client.ocr.process_async(**_ocr_request(document_url))
+
+    await asyncio.to_thread(_save_ocr_response, ocr_response, output_path, keep_image_base64)
     return ocr_response
 
-def parse_and_save_markdown(json_path: str, output_markdown_path: str):
+def ocr_batch(
+    file_paths: list[str],
+    output_paths: list[str],
+    poll_interval: int = BATCH_POLL_INTERVAL,
+    max_wait: int = BATCH_MAX_WAIT,
+) -> set[str]:
     """
-    Parses the JSON output from the OCR process, aggregates the markdown content,
-    and saves it to a markdown file.
+    Performs OCR on several PDFs as a single Mistral batch job (billed at the batch
+    rate) and saves each result to the matching entry of output_paths.
+
+    Returns the set of file paths whose OCR JSON was written; files that failed in
+    the batch are logged and left out so the caller can retry them individually.
+    A job still queued or running after max_wait seconds is cancelled and nothing
+    is returned.
     """
-    with open(json_path, 'r') as f:
-        data = json.load(f)
+    api_key = _require_api_key()
+    client = _get_client(api_key)
+    annotation_format = _annotation_format().model_dump(mode="json", by_alias=True)
+
+    requests = []
+    for idx, file_path in enumerate(file_paths):
+        requests.append({
+            "custom_id": str(idx),
+            "body": {
+                "document": {"type": "document_url", "document_url": _signed_document_url(api_key, file_path)},
+                "include_image_base64": True,
+                "bbox_annotation_format": annotation_format,
+            },
+        })
+
+    job = client.batch.jobs.create(endpoint="/v1/ocr", model=OCR_MODEL, requests=requests)
+    logging.info(f"Submitted Mistral OCR batch job {job.id} for {len(file_paths)} files.")
+    deadline = time.monotonic() + max_wait
+    while job.status in _BATCH_PENDING:
+        if time.monotonic() >= deadline:
+            client.batch.jobs.cancel(job_id=job.id)
+            logging.warning(f"OCR batch job {job.id} still {job.status} after {max_wait}s; cancelled.")
+            return set()
+        time.sleep(poll_interval)
+        job = client.batch.jobs.get(job_id=job.id)
 
-    full_markdown = ""
-    if "pages" in data and isinstance(data["pages"], list):
-        for page in data["pages"]:
-            if "markdown" in page:
-                full_markdown += page["markdown"] + "\n\n"
+    logging.info(
+        f"OCR batch job {job.id} finished with status {job.status} "
+        f"({job.succeeded_requests}/{job.total_requests} succeeded)."
+    )
+    if not job.output_file:
+        return set()
+
+    completed = set()
+    response = client.files.download(file_id=job.output_file)
+    for line in response.iter_lines():
+        if not line:
+            continue
+        result = orjson.loads(line)
+        idx = int(result["custom_id"])
+        ocr_result = result.get("response") or {}
+        if result.get("error") or ocr_result.get("status_code") != 200:
+            logging.error(f"OCR batch failed for {file_paths[idx]}: {result.get('error') or ocr_result.get('body')}")
+            continue
+        with open(output_paths[idx], "wb") as f:
+            f.write(orjson.dumps(ocr_result["body"]))
+        logging.info(f"OCR results saved to {output_paths[idx]}")
+        completed.add(file_paths[idx])
+
+    return completed
+
+def parse_and_save_markdown(ocr_source: str | dict, output_markdown_path: str):
+    """
+    Parses the OCR output (a path to the saved JSON, or the already-loaded response
+    dict), aggregates the markdown content, and saves it to a markdown file.
+    """
+    if isinstance(ocr_source, dict):
+        parts = [page["markdown"] for page in ocr_source.get("pages") or [] if "markdown" in page]
+    else:
+        # Stream only the per-page markdown strings; the base64 images are never materialized.
+        with open(ocr_source, 'rb') as f:
+            parts = list(ijson.items(f, "pages.item.markdown"))
+    save_markdown(parts, output_markdown_path)
 
-    with open(output_markdown_path, 'w') as f:
-        f.write(full_markdown)
+def save_markdown(parts: list[str], output_markdown_path: str):
+    """
+    Writes per-page markdown to a file, each page followed by a blank line.
+    Pages are streamed to the file rather than joined into one string first.
+    """
+    with open(output_markdown_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        for part in parts:
+            f.write(part)
+            f.write("\n\n")
 
     logging.info(f"Aggregated markdown saved to {output_markdown_path}")
@@ -4,7 +4,7 @@ import asyncio
 import logging
 from pathlib import Path
 import argparse
-from typing import Optional
+from typing import List, Optional
 from dotenv import load_dotenv
 
 # Add the current directory to sys.path to ensure imports work
@@ -12,6 +12,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from convert_stage import get_listing_dir, run_convert_stage
 from extract_stage import run_pipeline
+from src.config import LISTING_CONCURRENCY, OCR_CONCURRENCY
 from src.pipeline.classify_stage import classify_listing
 
 STAGES = ("convert", "classify", "extract", "all")
@@ -25,7 +26,13 @@ def _markdown_path(listing_dir: Path) -> str:
     return str(listing_dir / f"{base_name}_markdown.md")
 
 
-async def orchestrate(listing_name: str, stage: str = "all", agent: Optional[str] = None, no_cache: bool = False):
+async def orchestrate(
+    listing_name: str,
+    stage: str = "all",
+    agent: Optional[str] = None,
+    no_cache: bool = False,
+    ocr_semaphore: Optional[asyncio.Semaphore] = None,
+):
     """
     Orchestrates the 3-stage pipeline:
     convert -> classify -> extract
@@ -47,7 +54,7 @@ async def orchestrate(listing_name: str, stage: str = "all", agent: Optional[str
     if stage in ("convert", "all"):
         logging.info("STAGE 1: Converting documents to markdown...")
         try:
-            markdown_path = await run_convert_stage(listing_name)
+            markdown_path = await run_convert_stage(listing_name, ocr_semaphore)
             if not markdown_path or not os.path.exists(markdown_path):
                 logging.error("Failed to generate markdown path. Aborting.")
                 return
@@ -108,13 +115,34 @@ async def orchestrate(listing_name: str, stage: str = "all", agent: Optional[str
             logging.error(f"Error in Stage 3 (extract): {e}")
             return
 
+async def orchestrate_many(
+    listing_names: List[str],
+    stage: str = "all",
+    agent: Optional[str] = None,
+    no_cache: bool = False,
+    max_concurrency: int = LISTING_CONCURRENCY,
+):
+    """
+    Runs orchestrate for several listings concurrently, with at most
+    `max_concurrency` listings in flight at once. Per-file OCR shares one
+    OCR_CONCURRENCY cap across all of them.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    ocr_semaphore = asyncio.Semaphore(OCR_CONCURRENCY)
+
+    async def run(listing_name: str):
+        async with semaphore:
+            await orchestrate(listing_name, stage=stage, agent=agent, no_cache=no_cache, ocr_semaphore=ocr_semaphore)
+
+    await asyncio.gather(*(run(name) for name in listing_names))
+
 if __name__ == "__main__":
     load_dotenv()
     parser = argparse.ArgumentParser(description="Run the staged pipeline.")
-    parser.add_argument("listing_name")
+    parser.add_argument("listing_names", nargs="+", metavar="listing_name")
     parser.add_argument("--stage", choices=STAGES, default="all")
     parser.add_argument("--agent", choices=AGENT_CHOICES, default=None)
     parser.add_argument("--no-cache", action="store_true", help="Ignore cached agent outputs and regenerate.")
     args = parser.parse_args()
 
-    asyncio.run(orchestrate(args.listing_name, stage=args.stage, agent=args.agent, no_cache=args.no_cache))
+    asyncio.run(orchestrate_many(args.listing_names, stage=args.stage, agent=args.agent, no_cache=args.no_cache))
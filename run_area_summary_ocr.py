@@ -1,6 +1,6 @@
 import os
-from mistral_ocr import ocr_with_mistral, parse_and_save_markdown
-from convert_stage import extract_images_from_ocr
+from mistral_ocr import ocr_with_mistral
+from convert_stage import consume_ocr
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -14,9 +14,8 @@ images_dir = listing_dir / "area_summary_images"
 
 print(f"Processing {pdf_path}...")
 try:
-    ocr_with_mistral(str(pdf_path), str(json_path))
-    parse_and_save_markdown(str(json_path), str(markdown_path))
-    extract_images_from_ocr(str(json_path), str(images_dir))
+    ocr_data = ocr_with_mistral(str(pdf_path), str(json_path)).model_dump()
+    consume_ocr(ocr_data, str(markdown_path), str(images_dir))
     print("Done!")
 except Exception as e:
     print(f"Error: {e}")
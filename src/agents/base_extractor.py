@@ -2,29 +2,53 @@ from abc import ABC, abstractmethod
 from pydantic_ai import Agent
 from pydantic_ai.models.google import GoogleModel
 from pydantic_ai.providers.google import GoogleProvider
+from google.genai.types import HttpRetryOptions
 import os
 import logging
+from functools import lru_cache
 from typing import Type, Any
 from pydantic import BaseModel
 from src.config import EXTRACTION_MODEL
 
-# Configure Logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Retry 408/429/5xx responses and transient connection errors (never other 4xx) with
+# jittered exponential backoff: up to 3 attempts, waits capped at 8s.
+GEMINI_RETRY_OPTIONS = HttpRetryOptions(attempts=3, initial_delay=1.0, max_delay=8.0)
+
+# Sent as its own text part ahead of the document, so the markdown is never copied into a new prompt string
+EXTRACTION_PROMPT_PREFIX = "Extract data from the following document:\n\n"
+
+
+@lru_cache(maxsize=None)
+def _cached_provider(api_key: str) -> GoogleProvider:
+    """One provider (and so one pooled HTTP client) per API key, shared by every extraction agent."""
+    return GoogleProvider(api_key=api_key, retry_options=GEMINI_RETRY_OPTIONS)
+
+
+@lru_cache(maxsize=None)
+def _cached_agent(model_name: str, api_key: str, instructions: str, output_type: Type[BaseModel]) -> Agent:
+    """Builds each (model, prompt, output type) agent once per process so the output schema is only compiled once."""
+    # Output schemas defer their core-schema build until first use; do it here rather than on the first response
+    output_type.model_rebuild()
+    provider = _cached_provider(api_key)
+    model = GoogleModel(model_name, provider=provider)
+    return Agent(model, instructions=instructions, output_type=output_type)
+
 
 class BaseExtractor(ABC):
     def __init__(self, model_name: str = EXTRACTION_MODEL):
         self.api_key = os.environ.get("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY environment variable not set.")
-        
-        self.provider = GoogleProvider(api_key=self.api_key)
-        self.model = GoogleModel(model_name, provider=self.provider)
-        
-        self.agent = Agent(
-            self.model,
-            instructions=self.get_system_prompt(),
-            output_type=self.get_output_type(),
+
+        self.agent = _cached_agent(
+            model_name,
+            self.api_key,
+            self.get_system_prompt(),
+            self.get_output_type(),
         )
+        self.model = self.agent.model
 
     @abstractmethod
     def get_system_prompt(self) -> str:
@@ -38,27 +62,27 @@ class BaseExtractor(ABC):
 
     def run(self, markdown_content: str) -> BaseModel:
         """Runs the extraction agency against the provided markdown content."""
-        logging.info(f"Starting extraction with {self.__class__.__name__}...")
+        logger.info("Starting extraction with %s...", self.__class__.__name__)
         
         try:
-            result = self.agent.run_sync(f"Extract data from the following document:\n\n{markdown_content}")
-            logging.info(f"Extraction successful for {self.__class__.__name__}.")
+            result = self.agent.run_sync([EXTRACTION_PROMPT_PREFIX, markdown_content])
+            logger.info("Extraction successful for %s.", self.__class__.__name__)
             return result.output
         except Exception as e:
-            logging.error(f"Extraction failed for {self.__class__.__name__}: {e}")
+            logger.error("Extraction failed for %s: %s", self.__class__.__name__, e)
             raise e
 
     async def run_async(self, markdown_content: str) -> BaseModel:
         """Runs the extraction agent asynchronously on the current event loop (concurrent, no threads)."""
-        logging.info(f"Starting extraction with {self.__class__.__name__}...")
-        prompt = f"Extract data from the following document:\n\n{markdown_content}"
+        logger.info("Starting extraction with %s...", self.__class__.__name__)
+        prompt = [EXTRACTION_PROMPT_PREFIX, markdown_content]
         try:
             async with self.agent.iter(prompt) as agent_run:
                 async for _ in agent_run:
                     pass
             out = agent_run.result.output
-            logging.info(f"Extraction successful for {self.__class__.__name__}.")
+            logger.info("Extraction successful for %s.", self.__class__.__name__)
             return out
         except Exception as e:
-            logging.error(f"Extraction failed for {self.__class__.__name__}: {e}")
+            logger.error("Extraction failed for %s: %s", self.__class__.__name__, e)
             raise
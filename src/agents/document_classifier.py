@@ -7,6 +7,7 @@ from pydantic_ai.models.google import GoogleModel
 from pydantic_ai.providers.google import GoogleProvider
 
 from src.config import CLASSIFIER_MODEL
+from .base_extractor import GEMINI_RETRY_OPTIONS
 
 
 CLASSIFIER_SYSTEM_PROMPT = """
@@ -40,7 +41,7 @@ class DocumentClassifier:
             raise ValueError("GEMINI_API_KEY environment variable not set.")
 
         logging.info(f"Initializing classifier with model: {model_name}")
-        provider = GoogleProvider(api_key=self.api_key)
+        provider = GoogleProvider(api_key=self.api_key, retry_options=GEMINI_RETRY_OPTIONS)
         model = GoogleModel(model_name, provider=provider)
         self.agent = Agent(
             model,
@@ -48,9 +49,20 @@ class DocumentClassifier:
             output_type=DocumentClassification,
         )
 
-    def run(self, filename: str, preview: str) -> DocumentClassification:
-        prompt = f"FILENAME: {filename}\n\nPREVIEW:\n{preview or ''}"
-        result = self.agent.run_sync(prompt)
+    @staticmethod
+    def _prompt(filename: str, preview: str) -> str:
+        return f"FILENAME: {filename}\n\nPREVIEW:\n{preview or ''}"
+
+    @staticmethod
+    def _output(result, filename: str) -> DocumentClassification:
         if getattr(result, "output", None) is None:
             raise ValueError(f"Classifier did not return output for {filename}")
         return result.output
+
+    def run(self, filename: str, preview: str) -> DocumentClassification:
+        result = self.agent.run_sync(self._prompt(filename, preview))
+        return self._output(result, filename)
+
+    async def run_async(self, filename: str, preview: str) -> DocumentClassification:
+        result = await self.agent.run(self._prompt(filename, preview))
+        return self._output(result, filename)
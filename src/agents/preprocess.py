@@ -0,0 +1,18 @@
+import re
+
+_BLANK_RUN = re.compile(r"\n{3,}")
+_INLINE_IMAGE = re.compile(r"^!\[.*\]\(data:image")
+
+
+def compact(md: str) -> str:
+    """Drops OCR markdown that costs prompt tokens without giving any agent something to extract.
+
+    Removes inlined base64 images and trailing whitespace, and collapses runs of blank lines to one.
+    """
+    lines = []
+    for line in md.splitlines():
+        line = line.rstrip()
+        if _INLINE_IMAGE.match(line):
+            continue
+        lines.append(line)
+    return _BLANK_RUN.sub("\n\n", "\n".join(lines))
@@ -14,7 +14,15 @@ def _env_int(name: str, default: int) -> int:
 CLASSIFIER_MODEL = os.getenv("CLASSIFIER_MODEL", "gemini-2.0-flash-lite")
 CLASSIFIER_LINES = _env_int("CLASSIFIER_LINES", 100)
 CLASSIFIER_EXCEL_SHEET_LINES = _env_int("CLASSIFIER_EXCEL_SHEET_LINES", 10)
+CLASSIFIER_CONCURRENCY = _env_int("CLASSIFIER_CONCURRENCY", 4)
 EXTRACTION_MODEL = os.getenv("EXTRACTION_MODEL", "gemini-3-flash-preview")
+# Batch OCR is half price but a job can sit QUEUED for hours, so it is opt-in
+OCR_BATCH_ENABLED = os.getenv("OCR_BATCH_ENABLED") == "1"
+OCR_BATCH_MIN_FILES = _env_int("OCR_BATCH_MIN_FILES", 2)
+OCR_BATCH_MAX_WAIT = _env_int("OCR_BATCH_MAX_WAIT", 15 * 60)  # seconds before the job is cancelled
+OCR_CONCURRENCY = _env_int("OCR_CONCURRENCY", 4)
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", ".ocr_cache")
+LISTING_CONCURRENCY = _env_int("LISTING_CONCURRENCY", 8)
 
 DOC_CATEGORIES = ("om", "proforma", "research", "supplemental")
 PROCESSABLE_EXTS = (".pdf", ".xlsx", ".xls", ".md")
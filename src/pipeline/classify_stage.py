@@ -1,18 +1,21 @@
+import asyncio
 import hashlib
 import json
 import logging
+import os
 import re
 import shutil
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from src.config import (
     PROCESSABLE_EXTS,
     CLASSIFIER_LINES,
     CLASSIFIER_EXCEL_SHEET_LINES,
+    CLASSIFIER_CONCURRENCY,
     DOC_CATEGORIES,
 )
-from src.agents.document_classifier import DocumentClassifier
+from src.agents.document_classifier import DocumentClassifier, DocumentClassification
 
 INPUT_DIR_NAME = "input"
 
@@ -95,14 +98,14 @@ def get_process_files(listing_dir: Path) -> List[Path]:
             f"Place all source documents in: {input_dir}"
         )
 
-    all_files = sorted(input_dir.glob("*"))
-    return [
-        f for f in all_files
-        if f.is_file()
-        and f.suffix.lower() in PROCESSABLE_EXTS
-        and f.name not in {"doc_manifest.json", ".DS_Store"}
-        and not f.name.endswith("_markdown.md")
-    ]
+    with os.scandir(input_dir) as entries:
+        return sorted(
+            Path(e.path) for e in entries
+            if os.path.splitext(e.name)[1].lower() in PROCESSABLE_EXTS
+            and e.name != "doc_manifest.json"
+            and not e.name.endswith("_markdown.md")
+            and e.is_file()
+        )
 
 
 def _copy_file(source_path: Path, destination: Path) -> None:
@@ -110,12 +113,28 @@ def _copy_file(source_path: Path, destination: Path) -> None:
     shutil.copy2(source_path, destination)
 
 
+async def _classify_all(
+    classifier: DocumentClassifier,
+    previews: List[Tuple[Path, str]],
+    concurrency: int,
+) -> List[DocumentClassification]:
+    """Classifies all previews concurrently, with at most `concurrency` requests in flight."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def classify_one(source_file: Path, preview: str) -> DocumentClassification:
+        async with semaphore:
+            return await classifier.run_async(source_file.name, preview)
+
+    return await asyncio.gather(*(classify_one(f, p) for f, p in previews))
+
+
 def classify_listing(
     listing_dir: Path,
     classifier: Optional[DocumentClassifier] = None,
     classifier_lines: int = CLASSIFIER_LINES,
     excel_lines: int = CLASSIFIER_EXCEL_SHEET_LINES,
     force_rebuild_buckets: bool = True,
+    concurrency: int = CLASSIFIER_CONCURRENCY,
 ) -> Path:
     listing_dir = Path(listing_dir)
     temp_dir = listing_dir / "temp"
@@ -134,8 +153,8 @@ def classify_listing(
     classifier = classifier or DocumentClassifier()
     manifest_files: List[Dict[str, object]] = []
 
+    previews: List[Tuple[Path, str]] = []
     for source_file in process_files:
-        ext = source_file.suffix.lower()
         preview = _build_file_preview(
             source_file,
             temp_dir=temp_dir,
@@ -145,9 +164,12 @@ def classify_listing(
         if not preview.strip():
             logging.warning(f"No preview text for {source_file.name}; using filename fallback.")
             preview = source_file.name
+        previews.append((source_file, preview))
 
-        classification = classifier.run(source_file.name, preview)
+    classifications = asyncio.run(_classify_all(classifier, previews, concurrency))
 
+    for (source_file, preview), classification in zip(previews, classifications):
+        ext = source_file.suffix.lower()
         category = classification.category
         bucket_source_dir = buckets_dir / category / "source"
         bucket_temp_dir = buckets_dir / category / "temp"
@@ -3,9 +3,12 @@ from __future__ import annotations
 import hashlib
 import json
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import orjson
+
 from src.prompts import financial, market, overview, property, sponsor
 
 
@@ -78,6 +81,7 @@ def compute_manifest_signature(manifest: Dict[str, Any], file_entries: Optional[
     return _hash_payload(payload)
 
 
+@lru_cache(maxsize=None)
 def compute_prompt_signature(agent_name: str) -> str:
     prompt_module = AGENT_PROMPTS[agent_name]
     return _hash_payload({"agent": agent_name, "prompt": prompt_module.SYSTEM_PROMPT})
@@ -96,16 +100,14 @@ def compute_agent_input_signature(agent_name: str, agent_content: str, manifest_
 
 def _safe_load_json(path: Path) -> Optional[Dict[str, Any]]:
     try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return orjson.loads(path.read_bytes())
     except Exception:
         return None
 
 
 def _safe_write_json(path: Path, payload: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
+    path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
 
 
 def load_cached_agent_output(
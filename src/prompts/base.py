@@ -0,0 +1,11 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class ExtractionModel(BaseModel):
+    """
+    Base for the agent output schemas. Core-schema construction is deferred from
+    import to first use (building the agent), so stages that never run an
+    extraction agent do not pay for it.
+    """
+
+    model_config = ConfigDict(defer_build=True)
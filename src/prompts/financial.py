@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import Field
+from typing import List, Tuple, Optional
+
+from .base import ExtractionModel
 
 # --- System Prompt ---
 SYSTEM_PROMPT = """
@@ -50,68 +52,68 @@ You will be provided with the full text of the document (OCR output). Focus ONLY
 
 # --- Schema ---
 
-class Projection(BaseModel):
+class Projection(ExtractionModel):
     label: str = Field(..., description="Metric label, e.g. 'Target IRR' or 'Yield on Cost'")
     value: str = Field(..., description="Value, e.g. '17.7%'")
     description: str = Field(..., description="Short explanation of the metric")
 
-class ProjectionsSectionData(BaseModel):
-    projections: List[Projection] = Field(..., min_length=6, max_length=6, description="Exactly 6 key financial projections.")
+class ProjectionsSectionData(ExtractionModel):
+    projections: Tuple[Projection, Projection, Projection, Projection, Projection, Projection] = Field(..., description="Exactly 6 key financial projections.")
 
-class CapitalUseItem(BaseModel):
+class CapitalUseItem(ExtractionModel):
     use: str
     amount: str
     percentage: str
     description: str
 
-class CapitalSourceItem(BaseModel):
+class CapitalSourceItem(ExtractionModel):
     source: str
     amount: str
     perUnit: str
     percentage: str
     description: str
 
-class CapitalStackSectionData(BaseModel):
+class CapitalStackSectionData(ExtractionModel):
     uses: List[CapitalUseItem]
     sources: List[CapitalSourceItem]
     totalProject: str
 
-class WaterfallItem(BaseModel):
+class WaterfallItem(ExtractionModel):
     priority: str
     allocation: str
     description: str
     recipient: Optional[str]
 
-class DistributionWaterfallSectionData(BaseModel):
+class DistributionWaterfallSectionData(ExtractionModel):
     saleWaterfall: List[WaterfallItem]
     cashFlowDistribution: List[WaterfallItem]
     refinancingWaterfall: Optional[List[WaterfallItem]]
 
-class DistributionPhase(BaseModel):
+class DistributionPhase(ExtractionModel):
     year: str
     phase: str
     distribution: str
     description: str
 
-class DistributionTimelineSectionData(BaseModel):
+class DistributionTimelineSectionData(ExtractionModel):
     timeline: List[DistributionPhase]
 
-class TaxBenefit(BaseModel):
+class TaxBenefit(ExtractionModel):
     icon: str = Field(..., description="Lucide icon name, e.g. 'Calendar', 'Target', 'DollarSign'")
     title: str
     description: str
 
-class TaxBenefitsSectionData(BaseModel):
+class TaxBenefitsSectionData(ExtractionModel):
     benefits: List[TaxBenefit]
 
-class InvestmentStructureItem(BaseModel):
+class InvestmentStructureItem(ExtractionModel):
     label: str
     value: str
 
-class InvestmentStructureSectionData(BaseModel):
+class InvestmentStructureSectionData(ExtractionModel):
     structure: List[InvestmentStructureItem]
 
-class FinancialExtraction(BaseModel):
+class FinancialExtraction(ExtractionModel):
     projections: ProjectionsSectionData
     capitalStack: Optional[CapitalStackSectionData]
     waterfall: Optional[DistributionWaterfallSectionData]
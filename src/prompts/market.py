@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Literal
+from pydantic import Field
+from typing import List, Tuple, Optional, Literal
+
+from .base import ExtractionModel
 
 # --- System Prompt ---
 SYSTEM_PROMPT = """
@@ -46,49 +48,49 @@ Focus ONLY on the following sections:
 
 # --- Schema ---
 
-class MarketMetric(BaseModel):
+class MarketMetric(ExtractionModel):
     label: str
     value: str
     description: str
 
-class MarketMetricsSectionData(BaseModel):
+class MarketMetricsSectionData(ExtractionModel):
     metrics: List[MarketMetric] = Field(..., min_length=1, max_length=6, description="Up to 6 high-impact market metrics")
 
-class MajorEmployer(BaseModel):
+class MajorEmployer(ExtractionModel):
     name: str
     employees: str
     industry: str
     distance: str
 
-class MajorEmployersSectionData(BaseModel):
+class MajorEmployersSectionData(ExtractionModel):
     employers: List[MajorEmployer] = Field(..., min_length=4, max_length=8)
 
-class Demographic(BaseModel):
+class Demographic(ExtractionModel):
     category: str
     value: str
     description: str
 
-class DemographicsSectionData(BaseModel):
+class DemographicsSectionData(ExtractionModel):
     demographics: Optional[List[Demographic]]
     layout: Literal['list', 'matrix'] = 'list'
 
-class MarketDriver(BaseModel):
+class MarketDriver(ExtractionModel):
     title: str
     description: str
     icon: str
 
-class KeyMarketDriversSectionData(BaseModel):
-    drivers: List[MarketDriver] = Field(..., min_length=4, max_length=4)
+class KeyMarketDriversSectionData(ExtractionModel):
+    drivers: Tuple[MarketDriver, MarketDriver, MarketDriver, MarketDriver]
 
-class SupplyDemandItem(BaseModel):
+class SupplyDemandItem(ExtractionModel):
     icon: str
     title: str
     description: str
 
-class SupplyDemandSectionData(BaseModel):
+class SupplyDemandSectionData(ExtractionModel):
     analysis: List[SupplyDemandItem]
 
-class Competitor(BaseModel):
+class Competitor(ExtractionModel):
     name: str
     built: str
     beds: str
@@ -96,18 +98,18 @@ class Competitor(BaseModel):
     occupancy: str
     rentGrowth: str
 
-class CompetitiveAnalysisSectionData(BaseModel):
+class CompetitiveAnalysisSectionData(ExtractionModel):
     competitors: Optional[List[Competitor]]
     summary: Optional[str]
 
-class EconomicSector(BaseModel):
+class EconomicSector(ExtractionModel):
     title: str
     description: str
 
-class EconomicDiversificationSectionData(BaseModel):
+class EconomicDiversificationSectionData(ExtractionModel):
     sectors: List[EconomicSector]
 
-class MarketExtraction(BaseModel):
+class MarketExtraction(ExtractionModel):
     metrics: MarketMetricsSectionData
     employers: MajorEmployersSectionData
     demographics: Optional[DemographicsSectionData]
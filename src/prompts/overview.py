@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import List, Literal, Optional
+from pydantic import Field
+from typing import List, Tuple, Literal, Optional
+
+from .base import ExtractionModel
 
 # --- System Prompt ---
 SYSTEM_PROMPT = """
@@ -66,58 +68,58 @@ You will be provided with the full text of the document (OCR output). Focus ONLY
 
 # --- Schema ---
 
-class HeroSectionData(BaseModel):
+class HeroSectionData(ExtractionModel):
     listingName: str = Field(..., description="The main title of the listing.")
     location: str = Field(..., description="City and State, e.g. 'Mesa, AZ'")
     minInvestment: Optional[int] = Field(None, description="Minimum investment amount in USD, if stated.")
     fundName: str = Field(..., description="Name of the associated fund")
 
-class TickerMetric(BaseModel):
+class TickerMetric(ExtractionModel):
     label: str = Field(..., description="The metric label, e.g. 'Preferred Return' or 'Location'")
     value: str = Field(..., description="The value, e.g. '2.8x'")
     change: str = Field(..., description="Short context, e.g. '+12%' or 'Guaranteed'")
 
-class TickerMetricsSectionData(BaseModel):
-    metrics: List[TickerMetric] = Field(..., min_length=6, max_length=6, description="Exactly 6 key metrics")
+class TickerMetricsSectionData(ExtractionModel):
+    metrics: Tuple[TickerMetric, TickerMetric, TickerMetric, TickerMetric, TickerMetric, TickerMetric] = Field(..., description="Exactly 6 key metrics")
 
-class CompellingReason(BaseModel):
+class CompellingReason(ExtractionModel):
     title: str = Field(..., description="Short title, e.g. '100% Tax-Free Growth'")
     description: str = Field(..., description="1-2 sentences explaining the benefit.")
     highlight: str = Field(..., description="Short highlight text, e.g. '5-Minute Walk'")
     icon: str = Field(..., description="Lucide icon name, e.g. 'Rocket'")
 
-class CompellingReasonsSectionData(BaseModel):
-    reasons: List[CompellingReason] = Field(..., min_length=3, max_length=3, description="Exactly 3 compelling reasons")
+class CompellingReasonsSectionData(ExtractionModel):
+    reasons: Tuple[CompellingReason, CompellingReason, CompellingReason] = Field(..., description="Exactly 3 compelling reasons")
 
-class ExecutiveSummaryData(BaseModel):
+class ExecutiveSummaryData(ExtractionModel):
     quote: str = Field(..., description="A standout quote from the document")
-    paragraphs: List[str] = Field(..., min_length=2, max_length=2, description="Exactly two paragraphs summarizing the deal")
+    paragraphs: Tuple[str, str] = Field(..., description="Exactly two paragraphs summarizing the deal")
     conclusion: str = Field(..., description="A concluding sentence")
 
-class ExecutiveSummarySectionData(BaseModel):
+class ExecutiveSummarySectionData(ExtractionModel):
     summary: ExecutiveSummaryData
 
-class InvestmentCardKeyMetric(BaseModel):
+class InvestmentCardKeyMetric(ExtractionModel):
     label: str
     value: str
 
-class InvestmentCard(BaseModel):
+class InvestmentCard(ExtractionModel):
     id: Literal['financial-returns', 'fund-structure', 'property-overview', 'portfolio-projects', 'how-investors-participate', 'market-analysis', 'sponsor-profile']
     title: str
-    keyMetrics: List[InvestmentCardKeyMetric] = Field(..., min_length=3, max_length=3)
+    keyMetrics: Tuple[InvestmentCardKeyMetric, InvestmentCardKeyMetric, InvestmentCardKeyMetric]
     summary: str
 
-class InvestmentCardsSectionData(BaseModel):
-    cards: List[InvestmentCard] = Field(..., min_length=4, max_length=4, description="Exactly 4 investment summary cards")
+class InvestmentCardsSectionData(ExtractionModel):
+    cards: Tuple[InvestmentCard, InvestmentCard, InvestmentCard, InvestmentCard] = Field(..., description="Exactly 4 investment summary cards")
 
-class NewsCardMetadata(BaseModel):
+class NewsCardMetadata(ExtractionModel):
     url: str
     title: str
     description: str
     image: str
     source: str
 
-class OverviewExtraction(BaseModel):
+class OverviewExtraction(ExtractionModel):
     hero: HeroSectionData
     tickerMetrics: TickerMetricsSectionData
     compellingReasons: CompellingReasonsSectionData
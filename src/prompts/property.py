@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Literal
+from pydantic import Field
+from typing import List, Tuple, Optional, Literal
+
+from .base import ExtractionModel
 
 # --- System Prompt ---
 SYSTEM_PROMPT = """
@@ -37,70 +39,70 @@ Focus ONLY on the following sections:
 
 # --- Schema ---
 
-class KeyPropertyFact(BaseModel):
+class KeyPropertyFact(ExtractionModel):
     label: str = Field(..., description="Fact label, e.g. 'Total Units'")
     value: str = Field(..., description="Fact value, e.g. '388'")
     description: str = Field(..., description="Short context")
 
-class KeyFactsSectionData(BaseModel):
-    facts: List[KeyPropertyFact] = Field(..., min_length=4, max_length=4, description="Exactly 4 key property facts")
+class KeyFactsSectionData(ExtractionModel):
+    facts: Tuple[KeyPropertyFact, KeyPropertyFact, KeyPropertyFact, KeyPropertyFact] = Field(..., description="Exactly 4 key property facts")
 
-class Amenity(BaseModel):
+class Amenity(ExtractionModel):
     name: str
     icon: str = Field(..., description="Lucide icon name, e.g. 'Pool', 'Dumbbell'")
 
-class AmenitiesSectionData(BaseModel):
+class AmenitiesSectionData(ExtractionModel):
     amenities: List[Amenity] = Field(..., description="4 or 8 items")
 
-class UnitMixItem(BaseModel):
+class UnitMixItem(ExtractionModel):
     type: str = Field(..., description="e.g. 'Studio', '1-Bed'")
     count: int
     sqft: str
     rent: str
 
-class SpecialFeatures(BaseModel):
+class SpecialFeatures(ExtractionModel):
     title: str
     description: str
 
-class UnitMixSectionData(BaseModel):
+class UnitMixSectionData(ExtractionModel):
     unitMix: List[UnitMixItem]
     specialFeatures: Optional[SpecialFeatures] = Field(None, description="Optional title and description of unit features")
 
-class LocationHighlight(BaseModel):
+class LocationHighlight(ExtractionModel):
     title: str
     description: str
     icon: str
 
-class LocationHighlightsSectionData(BaseModel):
-    highlights: List[LocationHighlight] = Field(..., min_length=3, max_length=3)
+class LocationHighlightsSectionData(ExtractionModel):
+    highlights: Tuple[LocationHighlight, LocationHighlight, LocationHighlight]
 
-class LocationFeatureSection(BaseModel):
+class LocationFeatureSection(ExtractionModel):
     category: str
     icon: str
     features: List[str]
 
-class LocationFeaturesSectionData(BaseModel):
+class LocationFeaturesSectionData(ExtractionModel):
     featureSections: List[LocationFeatureSection]
 
-class DevelopmentPhase(BaseModel):
+class DevelopmentPhase(ExtractionModel):
     phase: str
     units: int
     sqft: str
     features: str
     timeline: str
 
-class DevelopmentPhasesSectionData(BaseModel):
+class DevelopmentPhasesSectionData(ExtractionModel):
     phases: List[DevelopmentPhase]
 
-class DevelopmentTimelineItem(BaseModel):
+class DevelopmentTimelineItem(ExtractionModel):
     status: Literal['completed', 'in_progress']
     title: str
     description: str
 
-class DevelopmentTimelineSectionData(BaseModel):
+class DevelopmentTimelineSectionData(ExtractionModel):
     timeline: List[DevelopmentTimelineItem]
 
-class PropertyExtraction(BaseModel):
+class PropertyExtraction(ExtractionModel):
     keyFacts: KeyFactsSectionData
     amenities: AmenitiesSectionData
     unitMix: Optional[UnitMixSectionData]
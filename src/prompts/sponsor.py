@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import Field
 from typing import List, Optional, Literal
 
+from .base import ExtractionModel
+
 # --- System Prompt ---
 SYSTEM_PROMPT = """
 You are an expert Real Estate Due Diligence Officer. Your goal is to extract the SPONSOR and FUND STRUCTURE data.
@@ -53,48 +55,48 @@ You are an expert Real Estate Due Diligence Officer. Your goal is to extract the
 
 # --- Schema ---
 
-class SponsorHighlightItem(BaseModel):
+class SponsorHighlightItem(ExtractionModel):
     icon: Optional[str] = Field(None, description="Lucide icon name")
     text: str
 
-class SponsorHighlights(BaseModel):
+class SponsorHighlights(ExtractionModel):
     type: Literal['list', 'icons']
     items: List[SponsorHighlightItem]
 
-class SponsorIntroContent(BaseModel):
+class SponsorIntroContent(ExtractionModel):
     paragraphs: List[str]
     highlights: SponsorHighlights
 
-class SponsorIntroSectionData(BaseModel):
+class SponsorIntroSectionData(ExtractionModel):
     sponsorName: str
     content: SponsorIntroContent
 
-class PartnershipOverviewPartner(BaseModel):
+class PartnershipOverviewPartner(ExtractionModel):
     name: str
     description: List[str]
 
-class PartnershipOverviewSectionData(BaseModel):
+class PartnershipOverviewSectionData(ExtractionModel):
     partners: List[PartnershipOverviewPartner]
     whyItMatters: Optional[List[str]] = None
 
-class TrackRecordMetric(BaseModel):
+class TrackRecordMetric(ExtractionModel):
     label: str
     value: str
     description: str
 
-class TrackRecordSectionData(BaseModel):
+class TrackRecordSectionData(ExtractionModel):
     metrics: List[TrackRecordMetric] = Field(..., description="4 or 8 metrics")
 
-class TeamMember(BaseModel):
+class TeamMember(ExtractionModel):
     name: str
     title: str
     experience: str
     background: str
 
-class LeadershipTeamSectionData(BaseModel):
+class LeadershipTeamSectionData(ExtractionModel):
     teamMembers: List[TeamMember] = Field(..., description="3 or 6 members")
 
-class PortfolioProject(BaseModel):
+class PortfolioProject(ExtractionModel):
     name: str
     location: str
     units: Optional[str]
@@ -102,56 +104,60 @@ class PortfolioProject(BaseModel):
     status: Literal['Completed', 'In Progress', 'Planning', 'Operating']
     returnsOrFocus: str
 
-class DevelopmentPortfolioSectionData(BaseModel):
+class InvestmentPhilosophy(ExtractionModel):
+    title: str
+    description: str
+
+class DevelopmentPortfolioSectionData(ExtractionModel):
     projects: List[PortfolioProject]
-    investmentPhilosophy: Optional[dict]
+    investmentPhilosophy: Optional[InvestmentPhilosophy] = Field(None, description="Optional title and description of the sponsor's investment philosophy")
 
-class KeyDevelopmentPartner(BaseModel):
+class KeyDevelopmentPartner(ExtractionModel):
     name: str
     role: str
     description: str
 
-class KeyDevelopmentPartnersSectionData(BaseModel):
+class KeyDevelopmentPartnersSectionData(ExtractionModel):
     partners: List[KeyDevelopmentPartner]
 
-class CompetitiveAdvantage(BaseModel):
+class CompetitiveAdvantage(ExtractionModel):
     icon: str
     title: str
     description: str
 
-class CompetitiveAdvantagesSectionData(BaseModel):
+class CompetitiveAdvantagesSectionData(ExtractionModel):
     advantages: List[CompetitiveAdvantage]
 
-class SponsorTeamMember(BaseModel):
+class SponsorTeamMember(ExtractionModel):
     name: str
     title: str
     roleDetail: Optional[str] = None
 
-class SponsorEntity(BaseModel):
+class SponsorEntity(ExtractionModel):
     name: str
     role: str
     descriptionPoints: List[str]
     team: List[SponsorTeamMember]
 
-class FundSponsorEntitiesSectionData(BaseModel):
+class FundSponsorEntitiesSectionData(ExtractionModel):
     entities: List[SponsorEntity]
 
-class ParticipationStep(BaseModel):
+class ParticipationStep(ExtractionModel):
     title: str
     icon: str
     points: List[str]
 
-class ParticipationStepsSectionData(BaseModel):
+class ParticipationStepsSectionData(ExtractionModel):
     steps: List[ParticipationStep]
 
-class FundDetailsItem(BaseModel):
+class FundDetailsItem(ExtractionModel):
     label: str
     value: str
 
-class FundDetailsSectionData(BaseModel):
+class FundDetailsSectionData(ExtractionModel):
     details: List[FundDetailsItem]
 
-class SponsorExtraction(BaseModel):
+class SponsorExtraction(ExtractionModel):
     intro: Optional[SponsorIntroSectionData]
     partnership: Optional[PartnershipOverviewSectionData]
     trackRecord: TrackRecordSectionData
@@ -0,0 +1,55 @@
+"""
+Disk cache for the API test scripts' JSON responses.
+
+Census ACS vintages never change and BLS series only update monthly, so repeated test runs
+can reuse a response for up to 30 days instead of going back over the wire.
+Set CACHE_DISABLE=1 to always hit the live API.
+
+Also home to dump(), which prints a full response only when TEST_VERBOSE=1.
+"""
+
+import hashlib
+import json
+import os
+import time
+import orjson
+from pathlib import Path
+
+CACHE_DIR = Path(os.getenv("API_CACHE_DIR", Path(__file__).parent / ".api_cache"))
+CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+VERBOSE = os.getenv("TEST_VERBOSE") == "1"
+
+
+def _cache_path(method, url, params):
+    # Keyed on the whole request, so a POST body (e.g. BLS series ids) is part of the key
+    key = json.dumps([method, url, params], sort_keys=True)
+    return CACHE_DIR / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+
+def load_response(method, url, params):
+    """The cached JSON for this request, or None when missing, expired or disabled."""
+    if os.getenv("CACHE_DISABLE") == "1":
+        return None
+    path = _cache_path(method, url, params)
+    try:
+        if time.time() - path.stat().st_mtime > CACHE_TTL_SECONDS:
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def store_response(method, url, params, data):
+    if os.getenv("CACHE_DISABLE") == "1":
+        return
+    path = _cache_path(method, url, params)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def dump(data):
+    """Pretty-prints a response for manual inspection; skipped (not even serialized) unless verbose."""
+    if VERBOSE:
+        print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
@@ -9,18 +9,76 @@ Required API Key: Get from https://api.census.gov/data/key_signup.html
 """
 
 import os
-import requests
+import asyncio
+import httpx
 import json
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
+from api_cache import load_response, store_response
 # import pytest # Removed pytest
 
 # Load environment variables
 load_dotenv()
 
-console = Console()
+# CI never looks at the tables, so skip rich's rendering there; assertions still run
+console = Console(quiet=bool(os.getenv('CI')))
+
+# Fail fast on a stalled connect or read instead of waiting out one long total timeout
+REQUEST_TIMEOUT = httpx.Timeout(10, connect=3, read=5)
+
+# Age groups: 25-34, 35-44, 45-54, 55-64
+AGE_GROUPS = {
+    '25-34': [
+        'B01001_010E',  # Male 25-29
+        'B01001_011E',  # Male 30-34
+        'B01001_034E',  # Female 25-29
+        'B01001_035E',  # Female 30-34
+    ],
+    '35-44': [
+        'B01001_012E',  # Male 35-39
+        'B01001_013E',  # Male 40-44
+        'B01001_036E',  # Female 35-39
+        'B01001_037E',  # Female 40-44
+    ],
+    '45-54': [
+        'B01001_014E',  # Male 45-49
+        'B01001_015E',  # Male 50-54
+        'B01001_038E',  # Female 45-49
+        'B01001_039E',  # Female 50-54
+    ],
+    '55-64': [
+        'B01001_016E',  # Male 55-59
+        'B01001_017E',  # Male 60-64
+        'B01001_040E',  # Female 55-59
+        'B01001_041E',  # Female 60-64
+    ],
+}
+
+# Educational attainment variables
+EDUCATION_VARIABLES = {
+    'B15003_022E': "Bachelor's",
+    'B15003_023E': "Master's",
+    'B15003_024E': 'Professional',
+    'B15003_025E': 'Doctorate',
+}
+
+# Housing, Poverty, and Employment variables
+HOUSING_POVERTY_VARIABLES = [
+    'B25002_001E',  # Total Housing Units
+    'B17001_002E',  # Poverty Status in the Past 12 Months: Below poverty level
+]
+
+# Every variable the tests read, fetched in one ACS call (the API allows up to 50 per request)
+ACS_VARIABLES = [
+    'B01003_001E',  # Total population
+    'B19013_001E',  # Median household income
+    *(variable for variables in AGE_GROUPS.values() for variable in variables),
+    *EDUCATION_VARIABLES,
+    *HOUSING_POVERTY_VARIABLES,
+]
+ACS_GET = f'NAME,{",".join(ACS_VARIABLES)}'
 
 # Removed pytest fixture
 # def tester():
@@ -39,293 +97,175 @@ class CensusAPITester:
             raise ValueError("CENSUS_API_KEY not found in environment variables")
         else:
             console.print(f"[green]CENSUS_API_KEY loaded: {self.api_key}[/green]")
+        self._row = {}
+
+    async def _fetch_all(self, client):
+        """Fetches every ACS variable in one request and keeps the county row keyed by variable name."""
+        console.print("\n[bold blue]Fetching ACS Data[/bold blue]")
+
+        # ACS 5-Year Data for 2022
+        url = f"{self.base_url}/2022/acs/acs5"
+        params = {
+            'get': ACS_GET,
+            'for': f'county:{self.test_county_fips}',
+            'in': f'state:{self.test_state_fips}',
+            'key': self.api_key
+        }
+
+        data = load_response("GET", url, params)
+        if data is None:
+            try:
+                response = await client.get(url, params=params)
+                response.raise_for_status()
+
+                # 204, or a 200 with an empty body: nothing to decode or cache
+                if not response.content:
+                    console.print(f"[yellow]✗ No content returned from API ({response.status_code})[/yellow]")
+                    return f"Skipped: No content returned from API ({response.status_code})"
+
+                data = response.json()
+                store_response("GET", url, params, data)
+            except httpx.HTTPError as e:
+                console.print(f"[red]✗ Error fetching ACS data: {e}[/red]")
+                assert False, f"Request failed: {e}"
+        else:
+            console.print("[green]Using cached ACS response (set CACHE_DISABLE=1 to refetch)[/green]")
+
+        if len(data) > 1:
+            self._row = dict(zip(data[0], data[1]))
+
+def _fmt(value):
+    """Thousands-separated when the value is an integer, otherwise as returned by the API."""
+    try:
+        return f"{int(value):,}"
+    except (ValueError, TypeError):
+        return str(value)
+
+def _print_fields(title, tester, fields):
+    table = Table(title=title)
+    table.add_column("Field", style="cyan")
+    table.add_column("Value", style="green")
+
+    for field in fields:
+        table.add_row(field, str(tester._row[field]))
+
+    console.print(table)
 
 def test_population_data(tester):
     """Test fetching population data for a county"""
     console.print("\n[bold blue]Testing Population Data Fetch[/bold blue]")
-    
-    # ACS 5-Year Data for 2022
-    url = f"{tester.base_url}/2022/acs/acs5"
-    params = {
-        'get': 'NAME,B01003_001E',  # Total population
-        'for': f'county:{tester.test_county_fips}',
-        'in': f'state:{tester.test_state_fips}',
-        'key': tester.api_key
-    }
-    
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        
-        if response.status_code == 204:
-            console.print("[yellow]✗ No content returned from API (204)[/yellow]")
-            # Removed pytest.skip
-            return "Skipped: No content returned from API (204)"
 
-        data = response.json()
-        
-        if len(data) > 1:
-            headers = data[0]
-            county_data = data[1]
-            
-            table = Table(title="Population Data")
-            table.add_column("Field", style="cyan")
-            table.add_column("Value", style="green")
-            
-            for i, header in enumerate(headers):
-                table.add_row(header, str(county_data[i]))
-            
-            console.print(table)
-            console.print(f"[green]✓ Successfully fetched population data[/green]")
-            assert True
-        else:
-            console.print("[red]✗ No data returned[/red]")
-            assert False, "No data returned"
-            
-    except requests.exceptions.RequestException as e:
-        console.print(f"[red]✗ Error fetching population data: {e}[/red]")
-        assert False, f"Request failed: {e}"
+    if tester._row:
+        _print_fields("Population Data", tester, ['NAME', 'B01003_001E'])
+        console.print(f"[green]✓ Successfully fetched population data[/green]")
+        assert True
+    else:
+        console.print("[red]✗ No data returned[/red]")
+        assert False, "No data returned"
 
 def test_income_data(tester):
     """Test fetching median household income data"""
     console.print("\n[bold blue]Testing Income Data Fetch[/bold blue]")
-    
-    url = f"{tester.base_url}/2022/acs/acs5"
-    params = {
-        'get': 'NAME,B19013_001E',  # Median household income
-        'for': f'county:{tester.test_county_fips}',
-        'in': f'state:{tester.test_state_fips}',
-        'key': tester.api_key
-    }
-    
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-
-        if response.status_code == 204:
-            console.print("[yellow]✗ No content returned from API (204)[/yellow]")
-            # Removed pytest.skip
-            return "Skipped: No content returned from API (204)"
 
-        data = response.json()
-        
-        if len(data) > 1:
-            headers = data[0]
-            county_data = data[1]
-            
-            table = Table(title="Income Data")
-            table.add_column("Field", style="cyan")
-            table.add_column("Value", style="green")
-            
-            for i, header in enumerate(headers):
-                table.add_row(header, str(county_data[i]))
-            
-            console.print(table)
-            console.print(f"[green]✓ Successfully fetched income data[/green]")
-            assert True
-        else:
-            console.print("[red]✗ No data returned[/red]")
-            assert False, "No data returned"
-            
-    except requests.exceptions.RequestException as e:
-        console.print(f"[red]✗ Error fetching income data: {e}[/red]")
-        assert False, f"Request failed: {e}"
+    if tester._row:
+        _print_fields("Income Data", tester, ['NAME', 'B19013_001E'])
+        console.print(f"[green]✓ Successfully fetched income data[/green]")
+        assert True
+    else:
+        console.print("[red]✗ No data returned[/red]")
+        assert False, "No data returned"
 
 def test_age_distribution(tester):
     """Test fetching age distribution data"""
     console.print("\n[bold blue]Testing Age Distribution Data Fetch[/bold blue]")
-    
-    # Age groups: 25-34, 35-44, 45-54, 55-64
-    age_variables = [
-        'B01001_010E',  # Male 25-29
-        'B01001_011E',  # Male 30-34
-        'B01001_012E',  # Male 35-39
-        'B01001_013E',  # Male 40-44
-        'B01001_014E',  # Male 45-49
-        'B01001_015E',  # Male 50-54
-        'B01001_016E',  # Male 55-59
-        'B01001_017E',  # Male 60-64
-        'B01001_034E',  # Female 25-29
-        'B01001_035E',  # Female 30-34
-        'B01001_036E',  # Female 35-39
-        'B01001_037E',  # Female 40-44
-        'B01001_038E',  # Female 45-49
-        'B01001_039E',  # Female 50-54
-        'B01001_040E',  # Female 55-59
-        'B01001_041E',  # Female 60-64
-    ]
-    
-    url = f"{tester.base_url}/2022/acs/acs5"
-    params = {
-        'get': f'NAME,{",".join(age_variables)}',
-        'for': f'county:{tester.test_county_fips}',
-        'in': f'state:{tester.test_state_fips}',
-        'key': tester.api_key
-    }
-    
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
 
-        if response.status_code == 204:
-            console.print("[yellow]✗ No content returned from API (204)[/yellow]")
-            # Removed pytest.skip
-            return "Skipped: No content returned from API (204)"
+    if tester._row:
+        # Calculate age groups
+        age_groups = {
+            age_group: sum(int(tester._row[variable]) for variable in variables)
+            for age_group, variables in AGE_GROUPS.items()
+        }
 
-        data = response.json()
-        
-        if len(data) > 1:
-            headers = data[0]
-            county_data = data[1]
-            
-            # Calculate age groups
-            age_groups = {
-                '25-34': int(county_data[1]) + int(county_data[2]) + int(county_data[9]) + int(county_data[10]),
-                '35-44': int(county_data[3]) + int(county_data[4]) + int(county_data[11]) + int(county_data[12]),
-                '45-54': int(county_data[5]) + int(county_data[6]) + int(county_data[13]) + int(county_data[14]),
-                '55-64': int(county_data[7]) + int(county_data[8]) + int(county_data[15]) + int(county_data[16])
-            }
-            
-            table = Table(title="Age Distribution (25-64)")
-            table.add_column("Age Group", style="cyan")
-            table.add_column("Population", style="green")
-            
-            for age_group, population in age_groups.items():
-                table.add_row(age_group, f"{population:,}")
-            
-            console.print(table)
-            console.print(f"[green]✓ Successfully fetched age distribution data[/green]")
-            assert True
-        else:
-            console.print("[red]✗ No data returned[/red]")
-            assert False, "No data returned"
-            
-    except requests.exceptions.RequestException as e:
-        console.print(f"[red]✗ Error fetching age distribution data: {e}[/red]")
-        assert False, f"Request failed: {e}"
+        table = Table(title="Age Distribution (25-64)")
+        table.add_column("Age Group", style="cyan")
+        table.add_column("Population", style="green")
+
+        for age_group, population in age_groups.items():
+            table.add_row(age_group, f"{population:,}")
+
+        console.print(table)
+        console.print(f"[green]✓ Successfully fetched age distribution data[/green]")
+        assert True
+    else:
+        console.print("[red]✗ No data returned[/red]")
+        assert False, "No data returned"
 
 def test_education_data(tester):
     """Test fetching educational attainment data"""
     console.print("\n[bold blue]Testing Education Data Fetch[/bold blue]")
-    
-    # Educational attainment variables
-    education_variables = [
-        'B15003_022E',  # Bachelor's degree
-        'B15003_023E',  # Master's degree
-        'B15003_024E',  # Professional degree
-        'B15003_025E',  # Doctorate degree
-    ]
-    
-    url = f"{tester.base_url}/2022/acs/acs5"
-    params = {
-        'get': f'NAME,{",".join(education_variables)}',
-        'for': f'county:{tester.test_county_fips}',
-        'in': f'state:{tester.test_state_fips}',
-        'key': tester.api_key
-    }
-    
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
 
-        if response.status_code == 204:
-            console.print("[yellow]✗ No content returned from API (204)[/yellow]")
-            # Removed pytest.skip
-            return "Skipped: No content returned from API (204)"
+    if tester._row:
+        # Calculate college-educated population
+        college_educated = sum(int(tester._row[variable]) for variable in EDUCATION_VARIABLES)
 
-        data = response.json()
-        
-        if len(data) > 1:
-            headers = data[0]
-            county_data = data[1]
-            
-            # Calculate college-educated population
-            college_educated = sum(int(county_data[i]) for i in range(1, 5))
-            
-            table = Table(title="Education Data")
-            table.add_column("Education Level", style="cyan")
-            table.add_column("Population", style="green")
-            
-            education_levels = ['Bachelor\'s', 'Master\'s', 'Professional', 'Doctorate']
-            for i, level in enumerate(education_levels):
-                table.add_row(level, f"{int(county_data[i+1]):,}")
-            
-            table.add_row("Total College Educated", f"{college_educated:,}", style="bold")
-            
-            console.print(table)
-            console.print(f"[green]✓ Successfully fetched education data[/green]")
-            assert True
-        else:
-            console.print("[red]✗ No data returned[/red]")
-            assert False, "No data returned"
-            
-    except requests.exceptions.RequestException as e:
-        console.print(f"[red]✗ Error fetching education data: {e}[/red]")
-        assert False, f"Request failed: {e}"
+        table = Table(title="Education Data")
+        table.add_column("Education Level", style="cyan")
+        table.add_column("Population", style="green")
+
+        for variable, level in EDUCATION_VARIABLES.items():
+            table.add_row(level, f"{int(tester._row[variable]):,}")
+
+        table.add_row("Total College Educated", f"{college_educated:,}", style="bold")
+
+        console.print(table)
+        console.print(f"[green]✓ Successfully fetched education data[/green]")
+        assert True
+    else:
+        console.print("[red]✗ No data returned[/red]")
+        assert False, "No data returned"
 
 # Removed pytest.mark.xfail
 def test_housing_poverty_employment_data(tester):
     """Test fetching housing, poverty, and employment data"""
     console.print("\n[bold blue]Testing Housing, Poverty, and Employment Data Fetch[/bold blue]")
-    
-    # Housing, Poverty, and Employment variables
-    variables = [
-        'B25002_001E',  # Total Housing Units
-        'B17001_002E',  # Poverty Status in the Past 12 Months: Below poverty level
-    ]
-    
-    url = f"{tester.base_url}/2022/acs/acs5"
-    params = {
-        'get': f'NAME,{",".join(variables)}',
-        'for': f'county:{tester.test_county_fips}',
-        'in': f'state:{tester.test_state_fips}',
-        'key': tester.api_key
-    }
-    
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-
-        if response.status_code == 204:
-            console.print("[yellow]✗ No content returned from API (204)[/yellow]")
-            # Removed pytest.skip
-            return "Skipped: No content returned from API (204)"
-            
-        data = response.json()
-        
-        if len(data) > 1:
-            headers = data[0]
-            county_data = data[1]
-            
-            table = Table(title="Housing, Poverty, and Employment Data")
-            table.add_column("Field", style="cyan")
-            table.add_column("Value", style="green")
-            
-            for i, header in enumerate(headers):
-                if i == 0:  # Skip NAME
-                    continue
-                table.add_row(headers[i], f"{int(county_data[i]):,}" if county_data[i].isdigit() else str(county_data[i]))
-            
-            console.print(table)
-            console.print(f"[green]✓ Successfully fetched housing, poverty, and employment data[/green]")
-            assert True
-        else:
-            console.print("[red]✗ No data returned[/red]")
-            assert False, "No data returned"
-            
-    except requests.exceptions.RequestException as e:
-        console.print(f"[red]✗ Error fetching housing, poverty, and employment data: {e}[/red]")
-        assert False, f"Request failed: {e}"
+
+    if tester._row:
+        table = Table(title="Housing, Poverty, and Employment Data")
+        table.add_column("Field", style="cyan")
+        table.add_column("Value", style="green")
+
+        for variable in HOUSING_POVERTY_VARIABLES:
+            table.add_row(variable, _fmt(tester._row[variable]))
+
+        console.print(table)
+        console.print(f"[green]✓ Successfully fetched housing, poverty, and employment data[/green]")
+        assert True
+    else:
+        console.print("[red]✗ No data returned[/red]")
+        assert False, "No data returned"
+
+
+async def run_all_tests(tester):
+    """Fetches the ACS data once, then runs every test against it."""
+    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+        await tester._fetch_all(client)
+    for test in [
+        test_population_data,
+        test_income_data,
+        test_age_distribution,
+        test_education_data,
+        test_housing_poverty_employment_data,
+    ]:
+        try:
+            test(tester)
+        except AssertionError as e:
+            console.print(f"[bold red]{test.__name__} failed: {e}[/bold red]")
 
 
 if __name__ == "__main__":
     try:
         tester = CensusAPITester()
-        test_population_data(tester)
-        test_income_data(tester)
-        test_age_distribution(tester)
-        test_education_data(tester)
-        test_housing_poverty_employment_data(tester)
+        asyncio.run(run_all_tests(tester))
     except ValueError as e:
         console.print(f"[bold red]Configuration Error: {e}[/bold red]")
     except Exception as e:
@@ -1,21 +1,42 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 # import pytest # Removed pytest
-import json
+import orjson
 from dotenv import load_dotenv
+from api_cache import dump, load_response, store_response
 
 load_dotenv()
 
+FRED_SEARCH_URL = "https://api.stlouisfed.org/fred/series/search"
+FRED_OBSERVATIONS_URL = "https://api.stlouisfed.org/fred/series/observations"
+
+# One keep-alive session, so each test's series search -> observations pair shares a connection
+_FRED_SESSION = requests.Session()
+_FRED_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+    ),
+)
+
 
 # Removed pytest decorators
+@lru_cache(maxsize=256)
 def check_fred_series_exists(api_key, series_id):
-    url = (
-        "https://api.stlouisfed.org/fred/series/search"
-        f"?search_text={series_id}&api_key={api_key}&file_type=json"
-    )
-    r = requests.get(url, timeout=15)
-    r.raise_for_status()  # Raise an exception for HTTP errors
-    data = r.json()
+    params = {"search_text": series_id, "api_key": api_key, "file_type": "json"}
+    # Series metadata doesn't change between runs, so the search response is cached on disk
+    data = load_response("GET", FRED_SEARCH_URL, params)
+    if data is None:
+        r = _FRED_SESSION.get(FRED_SEARCH_URL, params=params, timeout=15)
+        r.raise_for_status()  # Raise an exception for HTTP errors
+        data = orjson.loads(r.content)
+        store_response("GET", FRED_SEARCH_URL, params, data)
     
     # Check if 'series' key exists and if any series in the list has a matching ID
     if "seriess" in data and isinstance(data["seriess"], list):
@@ -26,6 +47,24 @@ def check_fred_series_exists(api_key, series_id):
     print(f"Series ID '{series_id}' does not exist.")
     return False
 
+def get_fred_observations(api_key, series_id):
+    """
+    Observations for a series, revalidated with If-None-Match against the cached ETag
+    so an unchanged series comes back as a bodyless 304 instead of a full download.
+    """
+    params = {"series_id": series_id, "api_key": api_key, "file_type": "json"}
+    cached = load_response("GET", FRED_OBSERVATIONS_URL, params)
+    headers = {"If-None-Match": cached["etag"]} if cached else {}
+    r = _FRED_SESSION.get(FRED_OBSERVATIONS_URL, params=params, headers=headers, timeout=15)
+    if r.status_code == 304:
+        return cached["data"]
+    assert r.status_code == 200, f"HTTP {r.status_code}: {r.text[:200]}"
+    data = orjson.loads(r.content)
+    etag = r.headers.get("ETag")
+    if etag:
+        store_response("GET", FRED_OBSERVATIONS_URL, params, {"etag": etag, "data": data})
+    return data
+
 def test_fred_county_gdp():
     api_key = os.getenv("FRED_API_KEY")
     if not api_key:
@@ -50,15 +89,9 @@ def test_fred_county_gdp():
         print(f"Skipping data request for non-existent series: {series_id}")
         return
 
-    url = (
-        "https://api.stlouisfed.org/fred/series/observations"
-        f"?series_id={series_id}&api_key={api_key}&file_type=json"
-    )
-    r = requests.get(url, timeout=15)
-    assert r.status_code == 200, f"HTTP {r.status_code}: {r.text[:200]}"
-    data = r.json()
+    data = get_fred_observations(api_key, series_id)
     print(f"--- FRED GDP Data for Series ID: {series_id} ---")
-    print(json.dumps(data, indent=4))
+    dump(data)
     assert "observations" in data and isinstance(data["observations"], list)
     assert len(data["observations"]) > 0
 
@@ -87,19 +120,16 @@ def test_fred_county_population():
         print(f"Skipping data request for non-existent series: {series_id}")
         return
 
-    url = (
-        "https://api.stlouisfed.org/fred/series/observations"
-        f"?series_id={series_id}&api_key={api_key}&file_type=json"
-    )
-    r = requests.get(url, timeout=15)
-    assert r.status_code == 200, f"HTTP {r.status_code}: {r.text[:200]}"
-    data = r.json()
+    data = get_fred_observations(api_key, series_id)
     print(f"--- FRED Population Data for Series ID: {series_id} ---")
-    print(json.dumps(data, indent=4))
+    dump(data)
     assert "observations" in data and isinstance(data["observations"], list)
     assert len(data["observations"]) > 0
 
 
 if __name__ == "__main__":
-    test_fred_county_gdp()
-    test_fred_county_population()
+    # The two tests are independent, so overlap their network waits
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(test_fred_county_gdp), executor.submit(test_fred_county_population)]
+        for future in futures:
+            future.result()
@@ -1,7 +1,36 @@
 import os
 import requests
 # import pytest # Removed pytest
-import json
+import orjson
+from api_cache import dump, load_response, store_response
+
+OZ_QUERY_URL = (
+    "https://services.arcgis.com/AgwDJMQH12AGieWa/ArcGIS/rest/services/"
+    "Opportunity_Zone_Index_FS/FeatureServer/0/query"
+)
+OUT_FIELDS = ",".join([
+    "OZ_2018_Values_Census_Tract_Qua",
+    "OZ_2018_Values_Census_Tract_Q_1",
+    "OZ_2018_Values_Census_Tract_Q_2",
+    "OZ_2018_Values_Census_Tract_Q_3",
+    "OZ_2018_Values_populationtotals",
+    "OZ_2018_Values_keyusfacts_tothh",
+    "OZ_2018_Values_retailmarketplac",
+    "OZ_2018_Values_industrybynaicsc",
+    "OZ_2018_Values_gender_medage_cy",
+    "OZ_2018_Values_householdincome_",
+    "OZ_2018_Values_wealth_medval_cy",
+    "OZ_2018_Values_householdincome1",
+    "OZ_2018_Values_wealth_medval_fy",
+    "OZ_2018_Values_educationalattai",
+    "OZ_2018_Values_industry_unemprt",
+    "OZ_2018_Values_populationtota_1",
+    "OZ_2018_Values_businesses_n01_b",
+    "OZ_2018_Values_employees_n01_em",
+    "OZ_2018_Values_raceandhispanico",
+    "Location",
+    "OZRanks_ExcelToTableUpdated_N_3",
+])
 
 # Removed pytest decorators
 def test_hud_opportunity_zones_comprehensive_data():
@@ -11,24 +40,27 @@ def test_hud_opportunity_zones_comprehensive_data():
     lng = float(os.getenv("TEST_LONGITUDE", "-115.1398"))
     
     # Test comprehensive OZ data including economic metrics
-    url = (
-        "https://services.arcgis.com/AgwDJMQH12AGieWa/ArcGIS/rest/services/"
-        "Opportunity_Zone_Index_FS/FeatureServer/0/query"
-        "?f=json"
-        "&geometryType=esriGeometryPoint"
-        f"&geometry={{'x':{lng},'y':{lat}}}"
-        "&inSR=4326"
-        "&spatialRel=esriSpatialRelIntersects"
-        "&returnGeometry=false"
-        "&outFields=OZ_2018_Values_Census_Tract_Qua,OZ_2018_Values_Census_Tract_Q_1,OZ_2018_Values_Census_Tract_Q_2,OZ_2018_Values_Census_Tract_Q_3,OZ_2018_Values_populationtotals,OZ_2018_Values_keyusfacts_tothh,OZ_2018_Values_retailmarketplac,OZ_2018_Values_industrybynaicsc,OZ_2018_Values_gender_medage_cy,OZ_2018_Values_householdincome_,OZ_2018_Values_wealth_medval_cy,OZ_2018_Values_householdincome1,OZ_2018_Values_wealth_medval_fy,OZ_2018_Values_educationalattai,OZ_2018_Values_industry_unemprt,OZ_2018_Values_populationtota_1,OZ_2018_Values_businesses_n01_b,OZ_2018_Values_employees_n01_em,OZ_2018_Values_raceandhispanico,Location,OZRanks_ExcelToTableUpdated_N_3"
-    )
+    params = {
+        "f": "json",
+        "geometryType": "esriGeometryPoint",
+        "geometry": f"{{'x':{lng},'y':{lat}}}",
+        "inSR": "4326",
+        "spatialRel": "esriSpatialRelIntersects",
+        "returnGeometry": "false",
+        "outFields": OUT_FIELDS,
+    }
     
-    r = requests.get(url, timeout=20)
-    assert r.status_code == 200, f"HTTP {r.status_code}: {r.text[:200]}"
-    data = r.json()
+    # The OZ layer and test coordinates rarely change, so reuse a cached response when there is one
+    data = load_response("GET", OZ_QUERY_URL, params)
+    if data is None:
+        r = requests.get(OZ_QUERY_URL, params=params, timeout=20)
+        assert r.status_code == 200, f"HTTP {r.status_code}: {r.text[:200]}"
+        data = orjson.loads(r.content)
+        # ArcGIS reports query errors with a 200, so only keep real results
+        if "features" in data:
+            store_response("GET", OZ_QUERY_URL, params, data)
     
-    print("\nFull JSON Response:")
-    print(json.dumps(data, indent=2))
+    dump(data)
 
     # Check response structure
     assert "features" in data and isinstance(data["features"], list)
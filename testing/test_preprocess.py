@@ -0,0 +1,17 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.preprocess import compact
+
+
+def test_compact_keeps_repeated_value_lines():
+    # Values like unit counts or rents legitimately repeat back-to-back in OCR output
+    md = "Unit Mix\n\n$1,250\n\n$1,250\n\n\n\n![img](data:image/png;base64,AAAA)\nTotal   \n"
+    assert compact(md) == "Unit Mix\n\n$1,250\n\n$1,250\n\nTotal"
+
+
+if __name__ == "__main__":
+    test_compact_keeps_repeated_value_lines()
+    print("OK")